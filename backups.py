@@ -0,0 +1,175 @@
+import os, json, gzip, hashlib, datetime, threading, time
+
+from storage import write_bytes_atomic
+from tracing import traced
+
+BACKUP_DIR = "backups"
+# (idade máxima em segundos, intervalo mínimo entre backups mantidos); 0 = mantém todos
+BACKUP_RETENTION = [
+    (3600, 0),              # última hora: todos
+    (86400, 3600),          # último dia: um por hora
+    (30 * 86400, 86400),    # último mês: um por dia
+]
+BACKUP_PRUNE_EVERY = 600    # segundos entre limpezas automáticas
+CHUNK_MASK = 0x0f           # fronteira de bloco a cada ~16 jogos, em média
+STAMP_FORMAT = "%Y%m%d_%H%M%S_%f"
+
+
+class BackupInfo:
+    def __init__(self, backup_id, created, count, legacy=False):
+        self.id = backup_id
+        self.created = created
+        self.count = count
+        self.legacy = legacy
+
+    def label(self):
+        return f"{self.created.strftime('%d/%m/%Y %H:%M:%S')} — {self.count if self.count is not None else '?'} jogos"
+
+
+class BackupStore:
+    """Backups deduplicados da biblioteca.
+
+    Cada backup é um manifesto pequeno que lista blocos de jogos; os blocos
+    são gravados uma vez só (gzip, endereçados por sha256). As fronteiras
+    dos blocos dependem do id dos jogos, então uma edição muda um único
+    bloco e o disco cresce com o tamanho das mudanças, não com o número
+    de salvamentos.
+    """
+
+    def __init__(self, root=BACKUP_DIR, retention=BACKUP_RETENTION):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.snapshots_dir = os.path.join(root, "snapshots")
+        self.retention = retention
+        self.lock = threading.Lock()
+        self.last_prune = 0
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+    # ----------- Blocos -----------
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + ".json.gz")
+
+    def _put_object(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_bytes_atomic(path, gzip.compress(data, 6), fsync=True)
+        return digest
+
+    def _chunks(self, games):
+        chunk = []
+        for game in games:
+            chunk.append(game)
+            key = str(game.get("id") or game.get("Nome", ""))
+            if hashlib.sha1(key.encode("utf-8")).digest()[0] & CHUNK_MASK == 0:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    # ----------- API -----------
+    @traced("backup.create")
+    def create(self, games):
+        # Retorna o id do backup criado, ou None se nada mudou desde o último
+        with self.lock:
+            digests = [self._put_object(json.dumps(c, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+                       for c in self._chunks(games)]
+            latest = self._latest_manifest()
+            if latest is not None and latest.get("chunks") == digests:
+                return None
+            created = datetime.datetime.now()
+            backup_id = f"{created.strftime(STAMP_FORMAT)}_n{len(games)}"
+            path = os.path.join(self.snapshots_dir, backup_id + ".json")
+            manifest = {"created": created.isoformat(), "count": len(games), "chunks": digests}
+            write_bytes_atomic(path, json.dumps(manifest).encode("utf-8"), fsync=True)
+        if time.time() - self.last_prune > BACKUP_PRUNE_EVERY:
+            self.prune()
+        return backup_id
+
+    def create_async(self, games):
+        threading.Thread(target=self.create, args=(games,), daemon=True).start()
+
+    def _latest_manifest(self):
+        names = sorted(n for n in os.listdir(self.snapshots_dir) if n.endswith(".json"))
+        if not names:
+            return None
+        with open(os.path.join(self.snapshots_dir, names[-1]), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def list(self):
+        # Só lê nomes de arquivos: data e quantidade de jogos estão no nome
+        found = []
+        for name in os.listdir(self.snapshots_dir):
+            if not name.endswith(".json"):
+                continue
+            stamp, _, count = name[:-5].rpartition("_n")
+            try:
+                found.append(BackupInfo(name[:-5], datetime.datetime.strptime(stamp, STAMP_FORMAT), int(count)))
+            except ValueError:
+                continue
+        # Backups antigos (cópia integral) continuam listáveis e restauráveis
+        for name in os.listdir(self.root):
+            if name.startswith("biblioteca_") and name.endswith(".json"):
+                try:
+                    created = datetime.datetime.strptime(name[11:-5], "%Y%m%d_%H%M%S")
+                except ValueError:
+                    continue
+                found.append(BackupInfo(name, created, None, legacy=True))
+        found.sort(key=lambda b: b.created, reverse=True)
+        return found
+
+    def restore(self, backup_id):
+        if backup_id.startswith("biblioteca_"):
+            with open(os.path.join(self.root, backup_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        with open(os.path.join(self.snapshots_dir, backup_id + ".json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        games = []
+        for digest in manifest["chunks"]:
+            with gzip.open(self._object_path(digest), "rb") as f:
+                games.extend(json.loads(f.read().decode("utf-8")))
+        return games
+
+    # ----------- Retenção -----------
+    def _expired(self, backups, now):
+        keep, buckets = set(), set()
+        for b in backups:   # do mais novo para o mais antigo
+            age = (now - b.created).total_seconds()
+            for tier, (max_age, interval) in enumerate(self.retention):
+                if age <= max_age:
+                    bucket = (tier, b.created.timestamp() // interval) if interval else (tier, b.id)
+                    if bucket not in buckets:
+                        buckets.add(bucket)
+                        keep.add(b.id)
+                    break
+        if backups:
+            keep.add(backups[0].id)     # o mais recente nunca é apagado
+        return [b for b in backups if b.id not in keep]
+
+    def prune(self, now=None):
+        with self.lock:
+            self.last_prune = time.time()
+            expired = self._expired(self.list(), now or datetime.datetime.now())
+            for b in expired:
+                path = os.path.join(self.root, b.id) if b.legacy else os.path.join(self.snapshots_dir, b.id + ".json")
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            # Coleta blocos que nenhum manifesto referencia mais
+            referenced = set()
+            for name in os.listdir(self.snapshots_dir):
+                if name.endswith(".json"):
+                    with open(os.path.join(self.snapshots_dir, name), "r", encoding="utf-8") as f:
+                        referenced.update(json.load(f).get("chunks", []))
+            for sub in os.listdir(self.objects_dir):
+                subdir = os.path.join(self.objects_dir, sub)
+                for name in os.listdir(subdir):
+                    if name.split(".")[0] not in referenced:
+                        os.remove(os.path.join(subdir, name))
+        return len(expired)
+
+    def prune_async(self):
+        threading.Thread(target=self.prune, daemon=True).start()
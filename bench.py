@@ -0,0 +1,254 @@
+import os, sys, json, time, random, shutil, argparse, platform, tempfile, statistics, datetime
+
+# Benchmark dos caminhos quentes, sem janela (QT_QPA_PLATFORM=offscreen) e sem rede:
+# gera biblioteca.json/profile.json sintéticos numa pasta temporária, abre o GameLibrary ali
+# e mede cada operação. A RAWG aponta para o rawg_stub e os ícones vêm de icons/ gerados localmente.
+# Uso: python bench.py                         (1k, 10k e 100k jogos)
+#      python bench.py --sizes 1000 --repeat 5 --out bench_results.json
+#      python bench.py --thresholds limites.json       (falha se alguma mediana passar do limite)
+#      python bench.py --baseline antigo.json --tolerance 1.3
+# limites.json: {"10000": {"load_library": 400, "search": 30}, "*": {"refresh_favs": 50}} (ms, mediana)
+
+BENCH_SIZES = (1000, 10000, 100000)
+BENCH_REPEAT = 3
+BENCH_QUERIES = ("a", "dark", "souls", "finalizado", "steam rpg", "xyzzy")
+BENCH_POSTS = 200       # posts no profile.json sintético
+BENCH_PRINTS = 10       # imagens distintas usadas pelos posts
+
+WORDS = ("Dark", "Souls", "Legend", "Hollow", "Knight", "Star", "Quest", "Final", "Fantasy", "Super",
+         "Mario", "Zelda", "Ori", "Forest", "Blind", "Dead", "Cells", "Hades", "Celeste", "Portal",
+         "City", "Skies", "Witcher", "Wild", "Hunt", "Metro", "Exodus", "Inside", "Limbo", "Rain")
+GENRES = ("Action", "RPG", "Indie", "Adventure", "Platformer", "Shooter", "Puzzle", "Strategy", "Racing")
+PRICES = ("", "R$ 19,90", "R$ 59,90", "R$ 129,99", "R$ 249,00", "0")
+
+
+def synthetic_games(n, plataformas, status_options, seed=0):
+    from storage import make_game
+    rnd = random.Random(seed)
+    games = []
+    for i in range(n):
+        nome = " ".join(rnd.sample(WORDS, rnd.randint(1, 3))) + f" {i}"
+        games.append(make_game({
+            "Nome": nome,
+            "Plataforma/Loja": rnd.choice(plataformas),
+            "Data de compra": f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/{rnd.randint(2010, 2025)}",
+            "Preço pago": rnd.choice(PRICES),
+            "Nota pessoal": str(rnd.randint(0, 10)),
+            "Status": rnd.choice(status_options),
+            "Gênero": ", ".join(rnd.sample(GENRES, rnd.randint(1, 3))),
+            "Descrição": " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(10, 40))),
+            "Desenvolvedor": f"Studio {rnd.randint(1, 200)}",
+            "Favorito": rnd.random() < 0.1,
+            "Anotações": rnd.choice(("", "", "platinar", "zerar de novo", "esperar promoção")),
+        }))
+    return games
+
+
+def synthetic_profile(prints_dir, seed=0):
+    from PyQt5.QtGui import QImage, QColor
+    rnd = random.Random(seed)
+    os.makedirs(prints_dir, exist_ok=True)
+    imgs = []
+    for i in range(BENCH_PRINTS):
+        path = os.path.join(prints_dir, f"bench_{i}.png")
+        image = QImage(1920, 1080, QImage.Format_RGB32)
+        image.fill(QColor(rnd.randint(0, 255), rnd.randint(0, 255), rnd.randint(0, 255)))
+        image.save(path)
+        imgs.append(path)
+    posts = [{
+        "text": " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(3, 30))),
+        "img": rnd.choice(imgs) if rnd.random() < 0.5 else "",
+        "created": datetime.datetime(2024, 1, 1).isoformat(),
+    } for _ in range(BENCH_POSTS)]
+    return {"nickname": "Bench", "bio": "perfil sintético", "avatar": None, "wallpaper": imgs[0], "posts": posts}
+
+
+def bundle_icons(names, icons_dir):
+    # Ícones "empacotados": o IconRegistry acha em icons/ e nunca chega a baixar
+    from PyQt5.QtGui import QImage, QColor
+    from icons import icon_file_name
+    os.makedirs(icons_dir, exist_ok=True)
+    for name in names:
+        image = QImage(48, 48, QImage.Format_ARGB32)
+        image.fill(QColor("#55aaff"))
+        image.save(os.path.join(icons_dir, icon_file_name(name)))
+
+
+def timed(fn, repeat, setup=None):
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - t0) * 1000)
+    return {"min": round(min(runs), 3), "median": round(statistics.median(runs), 3), "runs": [round(r, 3) for r in runs]}
+
+
+def bench_size(app, n, repeat, workdir):
+    import main, charts
+    from exporter import ExportJob, EXPORT_COLUMNS
+    from PyQt5.QtCore import Qt
+    os.makedirs(workdir)
+    os.chdir(workdir)
+    with open(main.BIB_PATH, "w", encoding="utf-8") as f:
+        json.dump(synthetic_games(n, main.PLATAFORMAS, main.STATUS_OPTIONS), f, ensure_ascii=False, indent=2)
+    with open(main.PROFILE_PATH, "w", encoding="utf-8") as f:
+        json.dump(synthetic_profile(main.PRINTS_DIR), f, ensure_ascii=False, indent=2)
+    bundle_icons(main.ICON_URLS, "icons")
+
+    results = {}
+    t0 = time.perf_counter()
+    window = main.GameLibrary()
+    ms = round((time.perf_counter() - t0) * 1000, 3)
+    results["startup"] = {"min": ms, "median": ms, "runs": [ms], "posts_shown": window.feed_shown}
+    window.show()
+    app.processEvents()
+
+    results["load_library"] = timed(window.load_library, repeat)
+
+    def save():
+        window.save_library()
+        window.writer.sync()
+    results["save_library"] = timed(save, repeat)
+    rnd = random.Random(1)
+
+    def touch():
+        # Um jogo alterado por rodada: o backup só grava os blocos que mudaram
+        game = rnd.choice(window.games)
+        window.library.update(game, {"Anotações": f"bench {rnd.random()}"})
+        window.writer.sync()
+    results["backup_library"] = timed(lambda: window.backups.create([dict(g) for g in window.games]), repeat, touch)
+
+    def reset_search():
+        # Cada rodada é uma busca nova, sem aproveitar o resultado da consulta anterior
+        window.input_search.setText("")
+        window.search_timer.stop()
+        window.search_index._last = None
+
+    search = {}
+    for query in BENCH_QUERIES:
+        def run(query=query):
+            window.input_search.setText(query)
+            window.search_timer.stop()
+            window.refresh_library()
+        search[query] = timed(run, repeat, reset_search)
+    results["search"] = {
+        "min": round(min(r["min"] for r in search.values()), 3),
+        "median": round(statistics.median(r["median"] for r in search.values()), 3),
+        "queries": search,
+    }
+    reset_search()
+    results["refresh_library"] = timed(window.refresh_library, repeat)
+    results["refresh_favs"] = timed(window.refresh_favs, repeat)
+
+    # O mesmo caminho da abertura: lê o profile.json e monta perfil e feed
+    results["load_profile"] = timed(window.load_profile, repeat)
+    results["summary_data"] = timed(lambda: charts.chart_data(window.stats), repeat)
+    try:
+        data = charts.chart_data(window.stats)
+        results["summary_render"] = timed(lambda: charts.render(data), repeat)
+    except ImportError as e:
+        results["summary_render"] = {"skipped": str(e)}
+
+    for fmt in ("csv", "xlsx"):
+        errors = []
+
+        def export(fmt=fmt):
+            job = ExportJob(f"bench_export.{fmt}", fmt, window.games, EXPORT_COLUMNS)
+            job.finished.connect(lambda rows, error: errors.append(error) if error else None, Qt.DirectConnection)
+            job.start()
+            job.thread.join()
+        results[f"export_{fmt}"] = timed(export, repeat)
+        if errors:
+            results[f"export_{fmt}"] = {"skipped": errors[0]}
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return results
+
+
+def check(results, thresholds=None, baseline=None, tolerance=1.25):
+    # Retorna a lista de regressões: mediana acima do limite fixo ou de baseline * tolerance
+    failures = []
+    for size, ops in results.items():
+        limits = dict((thresholds or {}).get("*", {}))
+        limits.update((thresholds or {}).get(size, {}))
+        base = (baseline or {}).get("sizes", {}).get(size, {})
+        for op, r in ops.items():
+            median = r.get("median")
+            if median is None:
+                continue
+            if op in limits and median > limits[op]:
+                failures.append(f"{op} @ {size}: {median:.1f} ms > limite {limits[op]} ms")
+            old = base.get(op, {}).get("median")
+            if old and median > old * tolerance:
+                failures.append(f"{op} @ {size}: {median:.1f} ms > {tolerance}x baseline ({old:.1f} ms)")
+    return failures
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless do GamesLog")
+    parser.add_argument("--sizes", default=",".join(map(str, BENCH_SIZES)), help="tamanhos da biblioteca, ex.: 1000,10000")
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--thresholds", help="JSON com limites em ms por tamanho e operação")
+    parser.add_argument("--baseline", help="resultado anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="quanto mais lento que o baseline ainda passa")
+    parser.add_argument("--keep", action="store_true", help="não apaga a pasta temporária")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, here)
+    out = os.path.abspath(args.out)
+    thresholds = baseline = None
+    if args.thresholds:
+        with open(args.thresholds, "r", encoding="utf-8") as f:
+            thresholds = json.load(f)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    from rawg_stub import RawgStub
+    root = tempfile.mkdtemp(prefix="gameslog-bench-")
+    cwd = os.getcwd()
+    with RawgStub() as stub:
+        # Antes de importar o main, que lê RAWG_API_URL na carga do módulo
+        os.environ["RAWG_API_URL"] = stub.base_url
+        os.environ.setdefault("RAWG_KEY", "bench")
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication(sys.argv[:1])
+        sizes = {}
+        try:
+            for n in (int(s) for s in args.sizes.split(",") if s.strip()):
+                print(f"{n} jogos...", file=sys.stderr)
+                sizes[str(n)] = bench_size(app, n, args.repeat, os.path.join(root, str(n)))
+                for op, r in sizes[str(n)].items():
+                    print(f"  {op:16} {r['median']:10.1f} ms" if "median" in r else f"  {op:16} pulado ({r['skipped']})", file=sys.stderr)
+        finally:
+            os.chdir(cwd)
+            if not args.keep:
+                shutil.rmtree(root, ignore_errors=True)
+
+    failures = check(sizes, thresholds, baseline, args.tolerance)
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage": os.environ.get("GAMESLOG_STORAGE", "json"),
+        "repeat": args.repeat,
+        "sizes": sizes,
+        "failures": failures,
+    }
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Resultados em {out}", file=sys.stderr)
+    for failure in failures:
+        print(f"REGRESSÃO: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
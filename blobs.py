@@ -0,0 +1,62 @@
+import os, hashlib
+
+from storage import write_bytes_atomic
+
+BLOBS_DIR = "covers"
+BLOB_PREFIX = "blob:"
+
+
+def is_blob_ref(value):
+    return isinstance(value, str) and value.startswith(BLOB_PREFIX)
+
+
+def blob_digest(value):
+    return value[len(BLOB_PREFIX):]
+
+
+class BlobStore:
+    """Imagens guardadas como arquivos crus, endereçados pelo sha256 do conteúdo.
+
+    O jogo referencia a capa como "blob:<sha256>"; a mesma imagem enviada
+    duas vezes ocupa um único arquivo.
+    """
+
+    def __init__(self, root=BLOBS_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_bytes_atomic(path, data, fsync=True)
+        return BLOB_PREFIX + digest
+
+    def put_file(self, src_path):
+        with open(src_path, "rb") as f:
+            return self.put(f.read())
+
+    def get(self, ref):
+        with open(self.path(blob_digest(ref)), "rb") as f:
+            return f.read()
+
+
+def migrate_inline_covers(games, store):
+    # Converte capas antigas (hex embutido no JSON) em blobs; retorna quantas foram migradas
+    migrated = 0
+    for game in games:
+        img = game.get("Imagem")
+        if game.get("Imagem_manual") and img and not is_blob_ref(img):
+            try:
+                game["Imagem"] = store.put(bytes.fromhex(img))
+                migrated += 1
+            except ValueError:
+                continue
+    return migrated
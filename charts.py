@@ -0,0 +1,121 @@
+import io
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from tracing import traced
+
+CHART_SIZE = (15, 10)       # polegadas
+CHART_DPI = 80
+CHART_CACHE = 4             # renderizações guardadas (versão dos dados, tema)
+CHART_FORMATS = ("png", "svg")
+
+
+def chart_data(stats):
+    # Cópia simples dos agregados, segura para levar para outra thread
+    return {
+        "lojas": stats.by_store.most_common(),
+        "status": stats.by_status.most_common(),
+        "generos": stats.by_genre.most_common(10),
+        "gastos": sorted(stats.spend_by_store.items()),
+        "total": stats.total_spend,
+    }
+
+
+def build_figure(data, fg="#f3f6fa"):
+    # Figure + canvas Agg direto, sem pyplot: pode rodar fora da thread da GUI.
+    # O matplotlib só é importado aqui, na primeira renderização (já na thread do ChartRenderer).
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=CHART_SIZE, dpi=CHART_DPI)
+    FigureCanvasAgg(fig)
+    fig.patch.set_alpha(0)
+    (ax_loja, ax_status), (ax_genero, ax_gasto) = fig.subplots(2, 2)
+    for ax, key, title in ((ax_loja, "lojas", "Jogos por Loja"), (ax_status, "status", "Status dos Jogos")):
+        items = data[key]
+        ax.pie([n for _, n in items], labels=[k for k, _ in items], autopct='%1.0f%%', textprops={"color": fg})
+        ax.set_title(title, color=fg)
+    bars = (
+        (ax_genero, data["generos"], 'skyblue', "Jogos por Gênero (Top 10)"),
+        (ax_gasto, data["gastos"], 'orange', f"Gastos por Plataforma (total R$ {data['total']:.2f})"),
+    )
+    for ax, items, color, title in bars:
+        ax.bar([k for k, _ in items], [v for _, v in items], color=color)
+        ax.set_title(title, color=fg)
+        ax.tick_params(colors=fg)
+        ax.tick_params(axis="x", labelrotation=90)
+        ax.set_facecolor("none")
+        for spine in ax.spines.values():
+            spine.set_color(fg)
+    fig.tight_layout()
+    return fig
+
+
+@traced("charts.render")
+def render(data, fmt="png", fg="#f3f6fa"):
+    out = io.BytesIO()
+    build_figure(data, fg).savefig(out, format=fmt, transparent=True)
+    return out.getvalue()
+
+
+class ChartRenderer(QObject):
+    """Renderiza o painel de gráficos numa thread, com cache por versão.
+
+    get(chave, ...) devolve o PNG na hora se aquela chave (versão dos dados
+    + tema) já foi renderizada; senão agenda e emite rendered(chave, png),
+    ou failed(chave, erro) se não deu para gerar (ex.: matplotlib ausente).
+    """
+    rendered = pyqtSignal(object, bytes)
+    failed = pyqtSignal(object, str)
+    exported = pyqtSignal(str, str)     # caminho, erro ("" se ok)
+    _done = pyqtSignal(object, bytes, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = OrderedDict()
+        self.pending = set()
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gameslog-charts")
+        self._done.connect(self._on_done)
+
+    def get(self, key, data, fg):
+        png = self.cache.get(key)
+        if png is not None:
+            self.cache.move_to_end(key)
+            return png
+        if key not in self.pending:
+            self.pending.add(key)
+            self.pool.submit(self._render, key, data, fg)
+        return None
+
+    def _render(self, key, data, fg):
+        png, error = b"", ""
+        try:
+            png = render(data, "png", fg)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        self._done.emit(key, png, error)
+
+    def _on_done(self, key, png, error):
+        self.pending.discard(key)
+        if error or not png:
+            self.failed.emit(key, error or "imagem vazia")
+            return
+        self.cache[key] = png
+        while len(self.cache) > CHART_CACHE:
+            self.cache.popitem(last=False)
+        self.rendered.emit(key, png)
+
+    def export(self, path, fmt, data, fg):
+        self.pool.submit(self._export, path, fmt, data, fg)
+
+    def _export(self, path, fmt, data, fg):
+        try:
+            with open(path, "wb") as f:
+                f.write(render(data, fmt, fg))
+            self.exported.emit(path, "")
+        except Exception as e:
+            self.exported.emit(path, str(e))
+
+    def close(self):
+        self.pool.shutdown(wait=False)
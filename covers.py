@@ -0,0 +1,363 @@
+import os, math, queue, hashlib, threading, multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from io import BytesIO
+
+from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from blobs import BlobStore, is_blob_ref, blob_digest
+from dispatch import Dispatcher
+from storage import write_bytes_atomic
+from tracing import span, traced
+
+COVER_CACHE_DIR = os.path.join("cache", "covers")
+COVER_MEM_BUDGET = 96 * 1024 * 1024     # bytes de QPixmap em memória
+COVER_DISK_BUDGET = 512 * 1024 * 1024   # bytes de miniaturas em disco
+COVER_WORKERS = 6                       # downloads/decodificações simultâneos
+COVER_SIZES = ((180, 260), (220, 320))  # card da grade e tela de detalhes, gerados juntos
+COVER_JPEG_QUALITY = 90
+COVER_PROCESSES = max(1, (os.cpu_count() or 2) - 1)     # decodificação em lote (capas importadas)
+COVER_BATCH_MIN = 8                     # capas pendentes a partir das quais o lote vai para os processos
+
+
+@traced("covers.render")
+def render_renditions(img_data, sizes=COVER_SIZES, quality=COVER_JPEG_QUALITY, raw=True):
+    """Decodifica a capa uma vez e gera todos os tamanhos.
+
+    Retorna {(w, h): (rgb, jpg)}: pixels RGB crus (vão direto para um QImage,
+    sem PNG no meio) e o JPEG para o cache em disco. Só PIL e bytes, então
+    roda tanto nas threads do CoverLoader quanto num processo separado;
+    com raw=False (prerender) rgb vem None e só o JPEG volta do processo.
+    """
+    # PIL só é carregado no primeiro corte, não na abertura do app
+    from PIL import Image
+    image = Image.open(BytesIO(img_data))
+    iw, ih = image.size
+    # JPEG grande: decodifica já reduzido (1/2, 1/4, 1/8) no menor tamanho que ainda cobre o maior alvo
+    need = max(max(tw / iw, th / ih) for tw, th in sizes)
+    image.draft("RGB", (math.ceil(iw * need), math.ceil(ih * need)))
+    image = image.convert("RGB")
+    iw, ih = image.size
+    out = {}
+    for tw, th in sizes:
+        scale = max(tw / iw, th / ih)
+        nw, nh = max(tw, round(iw * scale)), max(th, round(ih * scale))
+        # reducing_gap: fontes muito maiores passam antes por um reduce() inteiro, bem mais barato que só LANCZOS
+        fit = image.resize((nw, nh), Image.LANCZOS, reducing_gap=3.0)
+        left, top = (nw - tw) // 2, (nh - th) // 2
+        fit = fit.crop((left, top, left + tw, top + th))
+        jpg = BytesIO()
+        fit.save(jpg, "JPEG", quality=quality)
+        out[(tw, th)] = (fit.tobytes() if raw else None, jpg.getvalue())
+    return out
+
+
+def rgb_image(rgb, size):
+    # copy(): o QImage passa a ter o próprio buffer, independente dos bytes do Python
+    w, h = size
+    return QImage(rgb, w, h, 3 * w, QImage.Format_RGB888).copy()
+
+
+def pixmap_cost(pix):
+    return pix.width() * pix.height() * max(pix.depth(), 8) // 8
+
+
+def load_cover_source(game, blobs=None):
+    # Bytes originais da capa: blob local (upload manual), hex embutido (formato antigo) ou URL (RAWG)
+    src = game["Imagem"]
+    if is_blob_ref(src):
+        return (blobs or BlobStore()).get(src)
+    if game.get("Imagem_manual"):
+        return bytes.fromhex(src)
+    import requests
+    with span("net.get", url=src):
+        return requests.get(src, timeout=4).content
+
+
+class CoverCache:
+    """Cache de capas em dois níveis: LRU de QPixmap em memória + miniaturas em disco.
+
+    As miniaturas são endereçadas por conteúdo: a chave é o sha256 do blob da
+    capa (ou o sha1 da URL/hex antigo), combinado com o tamanho alvo
+    (ex.: 180x260, 220x320).
+    """
+
+    def __init__(self, cache_dir=COVER_CACHE_DIR, mem_budget=COVER_MEM_BUDGET, disk_budget=COVER_DISK_BUDGET, blobs=None):
+        self.cache_dir = cache_dir
+        self.blobs = blobs or BlobStore()
+        self.mem_budget = mem_budget
+        self.disk_budget = disk_budget
+        self.mem = OrderedDict()    # (key, size) -> QPixmap
+        self.mem_bytes = 0
+        self.disk = OrderedDict()   # nome do arquivo -> bytes, do mais antigo ao mais recente
+        self.disk_bytes = 0
+        self.failed = set()         # fontes que falharam nesta sessão
+        self._source_keys = {}      # string da fonte -> sha1
+        self.hits = self.disk_hits = self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scan_disk()
+
+    def _scan_disk(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            # .png: miniaturas do formato antigo, ficam na conta até saírem pelo orçamento
+            if entry.is_file() and entry.name.endswith((".jpg", ".png")):
+                st = entry.stat()
+                entries.append((st.st_mtime, entry.name, st.st_size))
+        for _, name, nbytes in sorted(entries):
+            self.disk[name] = nbytes
+            self.disk_bytes += nbytes
+
+    # ----------- Chaves -----------
+    def source_key(self, game):
+        src = game.get("Imagem")
+        if not src:
+            return None
+        if is_blob_ref(src):
+            return blob_digest(src)
+        key = self._source_keys.get(src)
+        if key is None:
+            key = hashlib.sha1(src.encode("utf-8")).hexdigest()
+            self._source_keys[src] = key
+        return key
+
+    def _file_name(self, key, size):
+        return f"{key}_{size[0]}x{size[1]}.jpg"
+
+    def _render(self, key, data, sizes=COVER_SIZES):
+        # Fora da thread da GUI: gera e grava todos os tamanhos; retorna {tamanho: (nome, bytes gravados, rgb)}
+        out = {}
+        for size, (rgb, jpg) in render_renditions(data, sizes).items():
+            name = self._file_name(key, size)
+            out[size] = (name, len(jpg) if self._write_file(name, jpg) else 0, rgb)
+        return out
+
+    # ----------- Memória -----------
+    def _mem_get(self, mkey):
+        pix = self.mem.get(mkey)
+        if pix is not None:
+            self.mem.move_to_end(mkey)
+        return pix
+
+    def _mem_put(self, mkey, pix):
+        old = self.mem.pop(mkey, None)
+        if old is not None:
+            self.mem_bytes -= pixmap_cost(old)
+        self.mem[mkey] = pix
+        self.mem_bytes += pixmap_cost(pix)
+        while self.mem_bytes > self.mem_budget and len(self.mem) > 1:
+            _, evicted = self.mem.popitem(last=False)
+            self.mem_bytes -= pixmap_cost(evicted)
+
+    # ----------- Disco -----------
+    def _write_file(self, name, data):
+        # Seguro para chamar fora da thread da GUI: só toca no sistema de arquivos
+        try:
+            write_bytes_atomic(os.path.join(self.cache_dir, name), data)
+            return True
+        except OSError:
+            return False
+
+    def _disk_account(self, name, nbytes):
+        self.disk_bytes -= self.disk.pop(name, 0)
+        self.disk[name] = nbytes
+        self.disk_bytes += nbytes
+        while self.disk_bytes > self.disk_budget and len(self.disk) > 1:
+            oldest = next(iter(self.disk))
+            self._disk_drop(oldest)
+
+    def _disk_drop(self, name):
+        self.disk_bytes -= self.disk.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
+
+    # ----------- API -----------
+    def cached(self, game, size):
+        key = self.source_key(game)
+        if key is None:
+            return None
+        return self._mem_get((key, tuple(size)))
+
+    def invalidate(self, game):
+        # Remove todas as variantes (tamanhos) da capa do jogo, ex.: ao trocar a capa
+        key = self.source_key(game)
+        if key is None:
+            return
+        self._source_keys.pop(game.get("Imagem"), None)
+        self.failed.discard(key)
+        for mkey in [k for k in self.mem if k[0] == key]:
+            self.mem_bytes -= pixmap_cost(self.mem.pop(mkey))
+        for name in [n for n in self.disk if n.startswith(key + "_")]:
+            self._disk_drop(name)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "mem_items": len(self.mem),
+            "mem_bytes": self.mem_bytes,
+            "disk_items": len(self.disk),
+            "disk_bytes": self.disk_bytes,
+        }
+
+
+class CoverLoader(QObject):
+    """Carrega capas fora da thread da GUI, num pool limitado de workers.
+
+    Cada pedido pertence a um grupo (ex.: "library", "favs"); cancel(grupo)
+    descarta os pedidos pendentes daquele grupo, de modo que resultados que
+    chegam para cards já destruídos por um refresh mais novo são ignorados.
+    prerender(jogos) gera em segundo plano todos os COVER_SIZES de capas novas
+    (downloads em threads, decodificação num pool de processos).
+    """
+    _written = pyqtSignal(object)
+
+    def __init__(self, cache, max_workers=COVER_WORKERS, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        # Pedidos por (key, size), agrupados por grupo (ex.: "library", "favs")
+        self.dispatch = Dispatcher(self._on_done, max_workers, "gameslog-covers", self)
+        self.queue = None   # capas esperando o prerender
+        self.prerender_thread = None
+        self.closing = threading.Event()
+        self._written.connect(self._account)
+
+    def request(self, game, size, callback, group="default"):
+        # Retorna o QPixmap se já estiver em memória; senão agenda e chama callback(pix|None) depois
+        key = self.cache.source_key(game)
+        if key is None:
+            return None
+        size = tuple(size)
+        mkey = (key, size)
+        pix = self.cache._mem_get(mkey)
+        if pix is not None:
+            self.cache.hits += 1
+            return pix
+        if key in self.cache.failed:
+            callback(None)
+            return None
+        if not self.dispatch.wait(mkey, callback, group):
+            name = self.cache._file_name(key, size)
+            disk_path = os.path.join(self.cache.cache_dir, name) if name in self.cache.disk else None
+            source = {"Imagem": game.get("Imagem"), "Imagem_manual": game.get("Imagem_manual")}
+            self.dispatch.submit(mkey, self._load, mkey, source, disk_path)
+        return None
+
+    def cancel(self, group):
+        self.dispatch.cancel(group)
+
+    def _load(self, mkey, game, disk_path):
+        # Fora da thread da GUI: miniatura do disco ou, num miss, decode da fonte; retorna (gravados, QImage|None)
+        key, size = mkey
+        written, image = {}, None
+        try:
+            if disk_path:
+                image = QImage(disk_path)
+            if image is None or image.isNull():
+                # Miss: um decode gera o card e a tela de detalhes de uma vez
+                renditions = self.cache._render(key, load_cover_source(game, self.cache.blobs), sorted(set(COVER_SIZES) | {size}))
+                written = {name: n for name, n, _ in renditions.values() if n}
+                image = rgb_image(renditions[size][2], size)
+        except Exception:
+            image = None
+        if image is not None and image.isNull():
+            image = None
+        return written, image
+
+    def _account(self, written):
+        for name, nbytes in written.items():
+            self.cache._disk_account(name, nbytes)
+
+    def _on_done(self, mkey, result):
+        written, image = result
+        key = mkey[0]
+        self._account(written)
+        pix = None
+        if image is not None:
+            pix = QPixmap.fromImage(image)
+            self.cache._mem_put(mkey, pix)
+            if written:
+                self.cache.misses += 1
+            else:
+                self.cache.disk_hits += 1
+        else:
+            self.cache.misses += 1
+            self.cache.failed.add(key)
+        return pix
+
+    # ----------- Prerender -----------
+    def prerender(self, games):
+        # Capas novas (jogo adicionado, capa trocada, importação): todos os tamanhos prontos antes de aparecerem
+        items = []
+        for game in games:
+            key = self.cache.source_key(game)
+            if key is not None and key not in self.cache.failed:
+                items.append((key, {"Imagem": game.get("Imagem"), "Imagem_manual": game.get("Imagem_manual")}))
+        if not items:
+            return
+        if self.queue is None:
+            self.queue = queue.Queue()
+            self.prerender_thread = threading.Thread(target=self._prerender_loop, daemon=True)
+            self.prerender_thread.start()
+        for item in items:
+            self.queue.put(item)
+
+    def _missing(self, key):
+        return any(not os.path.exists(os.path.join(self.cache.cache_dir, self.cache._file_name(key, size))) for size in COVER_SIZES)
+
+    def _prerender_loop(self):
+        # Downloads/leitura dos blobs em threads; o decode (CPU) em processos, usando todos os núcleos
+        io_pool = ThreadPoolExecutor(max_workers=COVER_WORKERS, thread_name_prefix="gameslog-covers-io")
+        cpu_pool = None
+        while not self.closing.is_set():
+            batch = [self.queue.get()]
+            while len(batch) < 64:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch = [(key, game) for key, game in dict(batch).items() if key and self._missing(key)]
+            if not batch or self.closing.is_set():
+                continue
+            sources = io_pool.map(lambda item: self._source(item[1]), batch)
+            pool = io_pool
+            if len(batch) >= COVER_BATCH_MIN:
+                # Lote (importação, enriquecimento): vale o custo de subir os processos
+                if cpu_pool is None:
+                    # spawn: fork de um processo Qt com várias threads pode herdar locks presos
+                    cpu_pool = ProcessPoolExecutor(max_workers=COVER_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+                pool = cpu_pool
+            futures = [(key, pool.submit(render_renditions, data, raw=False)) for (key, _), data in zip(batch, sources) if data]
+            written = {}
+            for key, future in futures:
+                if self.closing.is_set():
+                    break
+                try:
+                    renditions = future.result()
+                except Exception:
+                    continue
+                for size, (_, jpg) in renditions.items():
+                    name = self.cache._file_name(key, size)
+                    if self.cache._write_file(name, jpg):
+                        written[name] = len(jpg)
+            if written and not self.closing.is_set():
+                self._written.emit(written)
+        io_pool.shutdown(wait=False)
+        if cpu_pool is not None:
+            cpu_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _source(self, game):
+        try:
+            return load_cover_source(game, self.cache.blobs)
+        except Exception:
+            return None
+
+    def close(self):
+        self.closing.set()
+        self.dispatch.close()
+        if self.queue is not None:
+            self.queue.put((None, None))
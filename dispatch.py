@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class Dispatcher(QObject):
+    """Roda trabalhos num pool de threads e entrega o resultado na GUI.
+
+    Pedidos pela mesma chave dividem um trabalho só: wait(chave, callback)
+    registra quem espera e diz se ele já está agendado; submit(chave, fn, ...)
+    agenda. Quando fn termina, on_result(chave, resultado) roda na thread da
+    GUI e o valor devolvido vai para cada callback. cancel(grupo) descarta os
+    callbacks do grupo e tira da fila o que ninguém mais espera.
+    """
+    _done = pyqtSignal(object, object)
+
+    def __init__(self, on_result, max_workers, name, parent=None):
+        super().__init__(parent)
+        self.on_result = on_result
+        self.max_workers = max_workers
+        self.name = name
+        self.pool = None        # criado no primeiro submit
+        self.waiters = {}       # chave -> [(grupo, geração, callback)]
+        self.jobs = {}          # chave -> Future ainda não entregue
+        self.generations = {}
+        self._done.connect(self._on_done)
+
+    def wait(self, key, callback, group=None):
+        gen = self.generations.setdefault(group, 0)
+        self.waiters.setdefault(key, []).append((group, gen, callback))
+        return key in self.jobs
+
+    def submit(self, key, fn, *args):
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        self.jobs[key] = self.pool.submit(self._run, key, fn, args)
+
+    def _run(self, key, fn, args):
+        try:
+            result = fn(*args)
+        except Exception:
+            result = None
+        self._done.emit(key, result)
+
+    def _on_done(self, key, result):
+        self.jobs.pop(key, None)
+        value = self.on_result(key, result)
+        for group, gen, callback in self.waiters.pop(key, []):
+            if self.generations.get(group) == gen:
+                try:
+                    callback(value)
+                except RuntimeError:
+                    # widget já destruído
+                    pass
+
+    def cancel(self, group):
+        self.generations[group] = self.generations.get(group, 0) + 1
+        for key in list(self.waiters):
+            alive = [w for w in self.waiters[key] if w[0] != group]
+            if alive:
+                self.waiters[key] = alive
+                continue
+            del self.waiters[key]
+            # Só sai da fila o que ainda não começou; o que já começou termina e vai para o cache
+            job = self.jobs.get(key)
+            if job is not None and job.cancel():
+                del self.jobs[key]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,122 @@
+import os, json, threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from storage import write_atomic
+
+ENRICH_STATE_PATH = os.path.join("cache", "enrich_state.json")
+ENRICH_WORKERS = 8          # buscas simultâneas; o token bucket do RawgClient segura a taxa real
+ENRICH_BATCH = 50           # resultados entregues à GUI (e gravados) de tantos em tantos
+# campo da biblioteca -> chave devolvida por RawgClient.game_data
+ENRICH_FIELDS = {
+    "Gênero": "genero",
+    "Descrição": "descricao",
+    "Desenvolvedor": "dev",
+    "Link": "link",
+    "Data lançamento": "data_lancamento",
+}
+
+
+def needs_enrichment(game):
+    return bool(game.get("Nome")) and any(not game.get(f) for f in ENRICH_FIELDS)
+
+
+def enrichment_values(game, dados):
+    # Só preenche o que está vazio: nada do que o usuário digitou é sobrescrito
+    values = {}
+    for field, key in ENRICH_FIELDS.items():
+        if not game.get(field) and dados.get(key):
+            values[field] = dados[key]
+    if not game.get("Imagem") and not game.get("Imagem_manual") and dados.get("imagem"):
+        values["Imagem"] = dados["imagem"]
+    return values
+
+
+class EnrichJob(QObject):
+    """Completa metadados da biblioteca pela RAWG em segundo plano.
+
+    Os jogos são resolvidos por um pool limitado de threads, em lotes de
+    ENRICH_BATCH; cada lote chega à GUI por batchReady([(id, dados)], ids).
+    Depois de aplicar o lote, a GUI chama mark_done(ids) e só então os ids
+    vão para ENRICH_STATE_PATH: um job interrompido (cancelado ou app
+    fechado) continua de onde parou, sem pular lotes que nunca foram aplicados.
+    """
+    progress = pyqtSignal(int, int)
+    batchReady = pyqtSignal(list, list)     # [(id, dados)], ids resolvidos (com ou sem resultado)
+    finished = pyqtSignal(bool)     # True se terminou, False se foi cancelado
+
+    def __init__(self, client, games, state_path=ENRICH_STATE_PATH, workers=ENRICH_WORKERS,
+                 batch_size=ENRICH_BATCH, parent=None):
+        super().__init__(parent)
+        self.client = client
+        self.state_path = state_path
+        self.workers = workers
+        self.batch_size = batch_size
+        self.done = set(self.load_state(state_path))
+        self.todo = [(g["id"], g["Nome"]) for g in games if needs_enrichment(g) and g["id"] not in self.done]
+        self.total = len(self.todo) + len(self.done)
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="gameslog-enrich", daemon=True)
+
+    @staticmethod
+    def load_state(path=ENRICH_STATE_PATH):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f).get("done", [])
+        except (OSError, ValueError):
+            return []
+
+    @staticmethod
+    def has_state(path=ENRICH_STATE_PATH):
+        return os.path.exists(path)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def running(self):
+        return self.thread.is_alive()
+
+    def mark_done(self, ids):
+        # Thread da GUI, depois que o lote foi aplicado e entregue ao PersistWorker
+        self.done.update(ids)
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        write_atomic(self.state_path, {"done": sorted(self.done)})
+        self.progress.emit(len(self.done), self.total)
+
+    def clear_state(self):
+        try:
+            os.remove(self.state_path)
+        except OSError:
+            pass
+
+    def _resolve(self, item):
+        game_id, nome = item
+        if self.cancelled.is_set():
+            return game_id, None, False
+        try:
+            return game_id, self.client.game_data(nome), True
+        except Exception:
+            # erro de rede/API: não marca como feito, fica para a próxima rodada
+            return game_id, None, False
+
+    def _run(self):
+        self.progress.emit(len(self.done), self.total)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="gameslog-enrich") as pool:
+            for start in range(0, len(self.todo), self.batch_size):
+                if self.cancelled.is_set():
+                    break
+                chunk = self.todo[start:start + self.batch_size]
+                results, ids = [], []
+                for game_id, dados, ok in pool.map(self._resolve, chunk):
+                    if ok:
+                        ids.append(game_id)
+                        if dados:
+                            results.append((game_id, dados))
+                if ids:
+                    self.batchReady.emit(results, ids)
+        # Chega à GUI depois de todos os lotes (mesma fila de sinais)
+        self.finished.emit(not self.cancelled.is_set())
@@ -0,0 +1,134 @@
+import os, csv, threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from blobs import is_blob_ref
+from storage import GAME_FIELDS
+from tracing import traced
+
+EXPORT_CHUNK = 1000         # linhas por bloco escrito (e por aviso de progresso)
+EXPORT_FORMATS = {"CSV": "csv", "Excel": "xlsx", "Parquet": "parquet"}
+EXPORT_COLUMNS = [f for f in GAME_FIELDS if f not in ("Imagem", "Imagem_manual")]
+XLSX_CELL_LIMIT = 32767
+
+
+def cell(game, column):
+    value = game.get(column, "")
+    if column == "Imagem":
+        # Nunca exporta bytes de imagem: só URL ou referência ao blob
+        value = value if isinstance(value, str) and (value.startswith(("http://", "https://")) or is_blob_ref(value)) else ""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Sim" if value else ""
+    return str(value)
+
+
+def iter_chunks(games, columns, chunk=EXPORT_CHUNK):
+    for start in range(0, len(games), chunk):
+        yield [[cell(g, c) for c in columns] for g in games[start:start + chunk]]
+
+
+class CsvWriter:
+    def __init__(self, path, columns):
+        self.f = open(path, "w", encoding="utf-8-sig", newline="")
+        self.writer = csv.writer(self.f, delimiter=";")
+        self.writer.writerow(columns)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.f.close()
+
+
+class XlsxWriter:
+    # write_only: as linhas vão para o arquivo conforme chegam, memória constante
+    def __init__(self, path, columns):
+        from openpyxl import Workbook
+        self.path = path
+        self.wb = Workbook(write_only=True)
+        self.ws = self.wb.create_sheet("Biblioteca")
+        self.ws.append(columns)
+
+    def write(self, rows):
+        for row in rows:
+            self.ws.append([v[:XLSX_CELL_LIMIT] for v in row])
+
+    def close(self):
+        self.wb.save(self.path)
+
+
+class ParquetWriter:
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([(c, pa.string()) for c in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        cols = [self.pa.array([r[i] for r in rows], type=self.pa.string()) for i in range(len(self.columns))]
+        self.writer.write_table(self.pa.Table.from_arrays(cols, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "xlsx": XlsxWriter, "parquet": ParquetWriter}
+
+
+class ExportJob(QObject):
+    """Exporta jogos em blocos de EXPORT_CHUNK numa thread.
+
+    Recebe uma lista rasa dos jogos (as referências, não cópias) e lê cada
+    campo na hora de escrever; o arquivo é gravado num .tmp e só troca de
+    nome no fim, então cancelar ou falhar não deixa planilha pela metade.
+    """
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int, str)     # linhas exportadas, erro ("" se ok; "cancelado")
+
+    def __init__(self, path, fmt, games, columns, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.fmt = fmt
+        self.games = list(games)
+        self.columns = list(columns)
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="gameslog-export", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @traced("export.write")
+    def _run(self):
+        tmp = f"{self.path}.tmp"
+        done, error, writer = 0, "", None
+        try:
+            writer = WRITERS[self.fmt](tmp, self.columns)
+            for rows in iter_chunks(self.games, self.columns):
+                if self.cancelled.is_set():
+                    error = "cancelado"
+                    break
+                writer.write(rows)
+                done += len(rows)
+                self.progress.emit(done, len(self.games))
+            writer.close()
+            writer = None
+            if not error:
+                os.replace(tmp, self.path)
+        except Exception as e:
+            error = str(e)
+        finally:
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.finished.emit(done, error)
@@ -0,0 +1,94 @@
+import os, re, hashlib
+
+from PyQt5.QtGui import QIcon, QPixmap
+from PyQt5.QtCore import QObject
+
+from dispatch import Dispatcher
+from search import fold
+from storage import write_bytes_atomic
+from tracing import span
+
+ICONS_DIR = "icons"                                 # ícones empacotados com o app (opcional)
+ICON_CACHE_DIR = os.path.join("cache", "icons")     # ícones baixados uma vez e guardados
+
+
+def icon_file_name(name):
+    # "Resumo/Gráficos" -> "resumo_graficos.png"
+    return re.sub(r"[^a-z0-9]+", "_", fold(name)).strip("_") + ".png"
+
+
+class IconRegistry(QObject):
+    """Registro único de QIcons do app.
+
+    Procura o ícone em icons/ (empacotado), depois em cache/icons/; só se não
+    achar em nenhum dos dois baixa a URL, uma única vez e em segundo plano.
+    Widgets registrados com apply() recebem o ícone quando o download chega,
+    então abrir janelas e diálogos nunca espera pela rede.
+    """
+
+    def __init__(self, urls, bundle_dir=ICONS_DIR, cache_dir=ICON_CACHE_DIR, parent=None):
+        super().__init__(parent)
+        self.urls = urls
+        self.bundle_dir = bundle_dir
+        self.cache_dir = cache_dir
+        self.icons = {}         # nome -> QIcon
+        self.failed = set()     # downloads que falharam nesta sessão
+        self.dispatch = Dispatcher(self._on_fetched, 2, "gameslog-icons", self)
+
+    def _cache_path(self, name):
+        digest = hashlib.sha1(self.urls.get(name, name).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{digest}_{icon_file_name(name)}")
+
+    def _load_local(self, name):
+        for path in (os.path.join(self.bundle_dir, icon_file_name(name)), self._cache_path(name)):
+            if os.path.exists(path):
+                pix = QPixmap(path)
+                if not pix.isNull():
+                    return QIcon(pix)
+        return None
+
+    def icon(self, name):
+        icon = self.icons.get(name)
+        if icon is not None:
+            return icon
+        icon = self._load_local(name)
+        if icon is not None:
+            self.icons[name] = icon
+            return icon
+        self._fetch(name)
+        return QIcon()
+
+    def apply(self, widget, name):
+        # widget.setIcon agora (se já houver) e de novo quando o download terminar
+        icon = self.icon(name)
+        widget.setIcon(icon)
+        if icon.isNull() and name in self.dispatch.jobs:
+            self.dispatch.wait(name, widget.setIcon)
+        return widget
+
+    def _fetch(self, name):
+        url = self.urls.get(name)
+        if not url or name in self.dispatch.jobs or name in self.failed:
+            return
+        self.dispatch.submit(name, self._download, url)
+
+    def _download(self, url):
+        import requests
+        with span("net.get", url=url):
+            r = requests.get(url, timeout=5)
+        r.raise_for_status()
+        return r.content
+
+    def _on_fetched(self, name, data):
+        # Falha: os widgets recebem um QIcon vazio, o mesmo que já mostram
+        pix = QPixmap()
+        if not data or not pix.loadFromData(data):
+            self.failed.add(name)
+            return QIcon()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            write_bytes_atomic(self._cache_path(name), data)
+        except OSError:
+            pass
+        icon = self.icons[name] = QIcon(pix)
+        return icon
@@ -0,0 +1,345 @@
+import os, csv, json, codecs, datetime, threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from blobs import BLOB_PREFIX
+from search import fold
+from steam import STEAM_SCAN_CACHE, SteamScanner, steam_games
+from storage import GAME_FIELDS, make_game
+from tracing import traced
+
+IMPORT_BATCH = 500          # jogos por lote: um commit e um refresh da GUI por lote
+IMPORT_FORMATS = ("csv", "xlsx", "json", "jsonl")
+JSON_CHUNK = 1 << 16        # caracteres lidos por vez no streaming de JSON sem ijson
+
+# cabeçalho (normalizado com fold) -> campo da biblioteca
+COLUMN_ALIASES = {
+    "nome": "Nome", "name": "Nome", "jogo": "Nome", "titulo": "Nome", "title": "Nome", "game": "Nome",
+    "plataforma/loja": "Plataforma/Loja", "plataforma": "Plataforma/Loja", "loja": "Plataforma/Loja",
+    "platform": "Plataforma/Loja", "store": "Plataforma/Loja",
+    "data de compra": "Data de compra", "data compra": "Data de compra", "purchase date": "Data de compra",
+    "preco pago": "Preço pago", "preco": "Preço pago", "valor": "Preço pago", "price": "Preço pago",
+    "nº comprovante": "Nº comprovante", "no comprovante": "Nº comprovante", "comprovante": "Nº comprovante",
+    "nota pessoal": "Nota pessoal", "nota": "Nota pessoal", "rating": "Nota pessoal", "score": "Nota pessoal",
+    "status": "Status",
+    "imagem": "Imagem", "capa": "Imagem", "cover": "Imagem", "image": "Imagem",
+    "genero": "Gênero", "genre": "Gênero", "generos": "Gênero", "genres": "Gênero",
+    "descricao": "Descrição", "description": "Descrição",
+    "data lancamento": "Data lançamento", "data de lancamento": "Data lançamento", "release date": "Data lançamento",
+    "released": "Data lançamento",
+    "desenvolvedor": "Desenvolvedor", "developer": "Desenvolvedor", "dev": "Desenvolvedor",
+    "link": "Link", "url": "Link",
+    "favorito": "Favorito", "favorite": "Favorito", "fav": "Favorito",
+    "anotacoes": "Anotações", "notas": "Anotações", "notes": "Anotações", "obs": "Anotações",
+}
+TRUE_VALUES = {"1", "sim", "s", "true", "yes", "y", "x", "★"}
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("xlsx", "xlsm"):
+        return "xlsx"
+    if ext in ("json", "jsonl", "ndjson"):
+        return "jsonl" if ext != "json" else "json"
+    return "csv"
+
+
+def column_field(header):
+    if header in GAME_FIELDS:
+        return header
+    return COLUMN_ALIASES.get(" ".join(fold(header).replace("_", " ").split()))
+
+
+def map_columns(headers):
+    # Colunas reconhecidas -> campo (a primeira coluna de cada campo vence); as demais são ignoradas
+    mapping = {}
+    for header in headers:
+        field = column_field(header)
+        if field and field not in mapping.values():
+            mapping[header] = field
+    return mapping
+
+
+# ----------- Leitores (um registro por vez, memória constante) -----------
+def iter_csv(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        sample = f.read(8192)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.DictReader(f, dialect=dialect)
+
+
+def iter_xlsx(path):
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        headers = next(rows, None)
+        if headers is None:
+            return
+        headers = [str(h) if h is not None else "" for h in headers]
+        for row in rows:
+            if row and any(v is not None for v in row):
+                yield dict(zip(headers, row))
+    finally:
+        wb.close()
+
+
+class JsonStream:
+    """Lê valores JSON de um arquivo de texto aos pedaços, com json.JSONDecoder.raw_decode.
+
+    Só o valor corrente fica no buffer: um array de um milhão de jogos é
+    percorrido elemento a elemento, sem carregar o arquivo inteiro.
+    """
+
+    def __init__(self, f, chunk=JSON_CHUNK):
+        self.f = f
+        self.chunk = chunk
+        self.buf, self.pos, self.eof = "", 0, False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size):
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        # O que já foi consumido sai do buffer
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        # Próximo caractere que não é espaço ("" no fim do arquivo)
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill(self.chunk):
+                return self.buf[self.pos:self.pos + 1]
+
+    def take(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON inválido: esperava {char!r} na posição {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        size = self.chunk
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # Um número no fim do buffer pode continuar no próximo pedaço
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+    def member(self, name):
+        # Avança até o valor da chave name do objeto na posição atual; False se ela não existir
+        self.take("{")
+        while self.peek() not in ("}", ""):
+            key = self.value()
+            self.take(":")
+            if key == name:
+                return True
+            self.value()
+            if self.peek() == ",":
+                self.pos += 1
+        return False
+
+    def items(self):
+        # Elementos do array na posição atual, um por vez
+        self.take("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() != ",":
+                self.take("]")
+                return
+            self.pos += 1
+
+
+def iter_json(path):
+    # Lista de objetos no topo ou em {"games": [...]}, sempre em streaming: com ijson se instalado,
+    # senão com JsonStream (stdlib). Os dois caminhos aceitam os mesmos formatos.
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+    with open(path, "r", encoding="utf-8-sig") as f:
+        stream = JsonStream(f)
+        top = stream.peek()
+        if ijson is not None:
+            with open(path, "rb") as raw:
+                if raw.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+                    raw.seek(0)
+                items = ijson.items(raw, "item" if top == "[" else "games.item", use_float=True)
+                yield from (item for item in items if isinstance(item, dict))
+            return
+        if top == "[" or (top == "{" and stream.member("games") and stream.peek() == "["):
+            for item in stream.items():
+                if isinstance(item, dict):
+                    yield item
+
+
+def iter_jsonl(path):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(item, dict):
+                yield item
+
+
+READERS = {"csv": iter_csv, "xlsx": iter_xlsx, "json": iter_json, "jsonl": iter_jsonl}
+
+
+def iter_records(path, fmt=None):
+    return READERS[fmt or detect_format(path)](path)
+
+
+# ----------- Validação -----------
+def to_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.strftime("%d/%m/%Y")
+    return str(value).strip()
+
+
+def normalize(record, mapping, status_options, default_status):
+    # status_options: {status normalizado com fold: status}
+    vals = {}
+    for header, field in mapping.items():
+        value = record.get(header)
+        if field in ("Favorito", "Imagem_manual"):
+            vals[field] = value is True or fold(to_text(value)) in TRUE_VALUES
+        else:
+            vals[field] = to_text(value)
+    if not vals.get("Nome"):
+        return None
+    status = status_options.get(fold(vals.get("Status", "")))
+    vals["Status"] = status or default_status
+    if not vals.get("Imagem", "").startswith(("http://", "https://", BLOB_PREFIX)):
+        # Só URLs (ou blobs deste app) entram como capa; arquivos locais continuam sendo enviados pelo app
+        vals.pop("Imagem", None)
+    return vals
+
+
+def dedupe_key(game):
+    return fold(game.get("Nome", "")).strip(), fold(game.get("Plataforma/Loja", "")).strip()
+
+
+class ImportJob(QObject):
+    """Importa jogos de CSV/XLSX/JSON numa thread, em lotes de IMPORT_BATCH.
+
+    Os registros são lidos um a um, mapeados para os campos da biblioteca,
+    validados (Nome obrigatório, Status conhecido) e deduplicados por
+    (Nome, Plataforma/Loja) contra a biblioteca e o próprio arquivo. Cada
+    lote chega à GUI por batchReady(jogos).
+    """
+    batchReady = pyqtSignal(list)
+    progress = pyqtSignal(int, int, int)    # linhas lidas, importadas, ignoradas
+    finished = pyqtSignal(int, int, str)    # importadas, ignoradas, erro ("" se ok)
+
+    def __init__(self, path, existing, status_options, default_status, batch_size=IMPORT_BATCH, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.seen = {dedupe_key(g) for g in existing}
+        self.status_options = {fold(s): s for s in status_options}
+        self.default_status = default_status
+        self.batch_size = batch_size
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="gameslog-import", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @traced("import.read")
+    def _run(self):
+        read = imported = skipped = 0
+        batch, mappings, error = [], {}, ""
+        try:
+            for record in iter_records(self.path):
+                if self.cancelled.is_set():
+                    break
+                read += 1
+                # CSV/XLSX têm um cabeçalho só; em JSON cada formato de objeto ganha seu mapeamento
+                headers = tuple(record)
+                mapping = mappings.get(headers)
+                if mapping is None:
+                    mapping = mappings[headers] = map_columns(headers)
+                if read == 1 and "Nome" not in mapping.values():
+                    error = "Coluna de nome do jogo não encontrada."
+                    break
+                vals = normalize(record, mapping, self.status_options, self.default_status)
+                key = dedupe_key(vals) if vals else None
+                if key is None or key in self.seen:
+                    skipped += 1
+                    continue
+                self.seen.add(key)
+                batch.append(make_game(vals))
+                if len(batch) >= self.batch_size:
+                    imported += len(batch)
+                    self.batchReady.emit(batch)
+                    self.progress.emit(read, imported, skipped)
+                    batch = []
+        except Exception as e:
+            error = str(e)
+        if batch:
+            imported += len(batch)
+            self.batchReady.emit(batch)
+        self.progress.emit(read, imported, skipped)
+        self.finished.emit(imported, skipped, error)
+
+
+class SteamScanJob(QObject):
+    """Varre as bibliotecas da Steam numa thread e entrega os jogos novos.
+
+    Deduplica por (Nome, Plataforma/Loja) e pelo link da loja contra a
+    biblioteca; os novos chegam à GUI por batchReady(jogos), como no ImportJob.
+    """
+    batchReady = pyqtSignal(list)
+    finished = pyqtSignal(int, int, str)    # importados, instalados, erro ("" se ok)
+
+    def __init__(self, roots, existing, cache_path=STEAM_SCAN_CACHE, parent=None):
+        super().__init__(parent)
+        self.roots = list(roots)
+        self.cache_path = cache_path
+        self.seen = {dedupe_key(g) for g in existing}
+        self.links = {g.get("Link") for g in existing if g.get("Link")}
+        self.thread = threading.Thread(target=self._run, name="gameslog-steam", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    @traced("import.steam")
+    def _run(self):
+        novos, apps, error = [], [], ""
+        try:
+            apps = SteamScanner(self.roots, self.cache_path).scan()
+            novos = [make_game(v) for v in steam_games(apps)
+                     if dedupe_key(v) not in self.seen and v["Link"] not in self.links]
+        except Exception as e:
+            error = str(e)
+        if novos:
+            self.batchReady.emit(novos)
+        self.finished.emit(len(novos), len(apps), error)
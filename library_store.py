@@ -0,0 +1,137 @@
+class Change:
+    """Uma mutação da biblioteca.
+
+    kind: "added", "removed", "changed" ou "reset"; games: jogos afetados;
+    fields: campos alterados (só em "changed"); old: id -> valores antigos
+    desses campos, para saber em que views o jogo estava antes da mudança.
+    """
+    __slots__ = ("kind", "games", "fields", "old")
+
+    def __init__(self, kind, games=(), fields=(), old=None):
+        self.kind = kind
+        self.games = list(games)
+        self.fields = set(fields)
+        self.old = old or {}
+
+
+class View:
+    """Versão de uma view (aba/grade) da biblioteca.
+
+    fields: campos que a view mostra (None = qualquer campo);
+    match(jogo): se o jogo aparece na view (None = todos). Uma mudança só
+    invalida a view se tocar um jogo que está (ou estava) nela e num campo
+    que ela mostra. dirty diz se a view precisa ser redesenhada.
+    patch(change), se houver, tenta aplicar a mudança direto na view já
+    desenhada (só os cards afetados) e devolve True se conseguiu; assim ela
+    continua sincronizada sem redesenho completo.
+    """
+
+    def __init__(self, name, fields=None, match=None, patch=None):
+        self.name = name
+        self.fields = set(fields) if fields is not None else None
+        self.match = match
+        self.patch = patch
+        self.version = 1
+        self.synced = 0
+
+    @property
+    def dirty(self):
+        return self.synced != self.version
+
+    def invalidate(self):
+        self.version += 1
+
+    def mark_synced(self):
+        self.synced = self.version
+
+    def affected(self, change):
+        if change.kind == "reset":
+            return True
+        if change.kind == "changed" and self.fields is not None and not (change.fields & self.fields):
+            return False
+        if self.match is None:
+            return True
+        for game in change.games:
+            if self.match(game):
+                return True
+            old = change.old.get(game.get("id"))
+            if old and self.match({**game, **old}):
+                return True
+        return False
+
+
+class LibraryStore:
+    """Lista de jogos observável: toda mutação passa por aqui e vira um Change.
+
+    Os assinantes (índices, estatísticas, gravação) recebem o Change na hora;
+    as views registradas são invalidadas só quando a mudança as afeta.
+    A lista games é sempre o mesmo objeto (reset troca o conteúdo); by_id
+    acha um jogo pelo id persistente em O(1).
+    """
+
+    def __init__(self):
+        self.games = []
+        self.by_id = {}
+        self.version = 0
+        self.views = {}
+        self.listeners = []
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def view(self, name, fields=None, match=None, patch=None):
+        view = self.views[name] = View(name, fields, match, patch)
+        return view
+
+    def get(self, game_id):
+        return self.by_id.get(game_id)
+
+    def _emit(self, change):
+        self.version += 1
+        for callback in self.listeners:
+            callback(change)
+        for view in self.views.values():
+            if not view.affected(change):
+                continue
+            synced = not view.dirty
+            view.invalidate()
+            if synced and view.patch is not None and view.patch(change):
+                view.mark_synced()
+
+    # ----------- Mutações -----------
+    def reset(self, games):
+        self.games[:] = games
+        self.by_id = {g["id"]: g for g in self.games}
+        self._emit(Change("reset", self.games))
+
+    def add(self, game):
+        self.add_many([game])
+
+    def add_many(self, games):
+        if not games:
+            return
+        self.games.extend(games)
+        for g in games:
+            self.by_id[g["id"]] = g
+        self._emit(Change("added", games))
+
+    def remove(self, game):
+        # Pelo id: nunca compara dicionários inteiros
+        game = self.by_id.pop(game["id"], None)
+        if game is None:
+            return
+        for i, g in enumerate(self.games):
+            if g is game:
+                del self.games[i]
+                break
+        self._emit(Change("removed", [game]))
+
+    def update(self, game, values):
+        # Aplica values no jogo e avisa só se algum campo realmente mudou
+        old = {k: game.get(k) for k, v in values.items() if game.get(k) != v}
+        if not old:
+            return False
+        for field in old:
+            game[field] = values[field]
+        self._emit(Change("changed", [game], old, {game.get("id"): old}))
+        return True
@@ -0,0 +1,184 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen, QCursor
+from PyQt5.QtCore import Qt, QSize, QRectF, QModelIndex, QAbstractListModel, pyqtSignal
+
+GameRole = Qt.UserRole + 1
+
+CARD_SIZE = (180, 260)
+CARD_MARGIN = 11
+CARD_RADIUS = 17
+
+
+class GameListModel(QAbstractListModel):
+    """Jogos da grade; rows (id -> linha) permite atualizar um card só."""
+
+    def __init__(self, tooltip=None, parent=None):
+        super().__init__(parent)
+        self.games = []
+        self.rows = {}
+        self.tooltip = tooltip
+
+    def set_games(self, games):
+        self.beginResetModel()
+        self.games = list(games)
+        self.rows = {g["id"]: i for i, g in enumerate(self.games)}
+        self.endResetModel()
+
+    def contains(self, game):
+        return game["id"] in self.rows
+
+    def refresh_game(self, game):
+        # Redesenha só o card do jogo (se ele estiver na grade)
+        row = self.rows.get(game["id"])
+        if row is None:
+            return False
+        self.games[row] = game
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def remove_game(self, game):
+        row = self.rows.pop(game["id"], None)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.games[row]
+        for i in range(row, len(self.games)):
+            self.rows[self.games[i]["id"]] = i
+        self.endRemoveRows()
+        return True
+
+    def append_games(self, games):
+        games = [g for g in games if g["id"] not in self.rows]
+        if not games:
+            return
+        first = len(self.games)
+        self.beginInsertRows(QModelIndex(), first, first + len(games) - 1)
+        for i, g in enumerate(games, first):
+            self.games.append(g)
+            self.rows[g["id"]] = i
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.games)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.games):
+            return None
+        game = self.games[index.row()]
+        if role == GameRole:
+            return game
+        if role == Qt.DisplayRole:
+            return game.get("Nome", "")
+        if role == Qt.ToolTipRole and self.tooltip:
+            return self.tooltip(game)
+        return None
+
+
+class CoverDelegate(QStyledItemDelegate):
+    """Desenha o card (capa, borda, destaque de hover) só para os itens visíveis."""
+
+    def __init__(self, loader, group, parent=None):
+        super().__init__(parent)
+        self.loader = loader
+        self.group = group
+        self.requested = set()
+
+    def reset(self):
+        self.loader.cancel(self.group)
+        self.requested.clear()
+
+    def sizeHint(self, option, index):
+        return QSize(CARD_SIZE[0] + 2 * CARD_MARGIN, CARD_SIZE[1] + 2 * CARD_MARGIN)
+
+    def cover_for(self, game):
+        cache = self.loader.cache
+        key = cache.source_key(game)
+        if key is None or key in cache.failed:
+            return None, "Sem imagem"
+        pix = cache.cached(game, CARD_SIZE)
+        if pix is not None:
+            return pix, None
+        if key not in self.requested:
+            self.requested.add(key)
+            view = self.parent()
+
+            def arrived(pix, key=key):
+                self.requested.discard(key)
+                view.viewport().update()
+            pix = self.loader.request(game, CARD_SIZE, arrived, self.group)
+            if pix is not None:
+                self.requested.discard(key)
+                return pix, None
+        return None, "Carregando..."
+
+    def paint(self, painter, option, index):
+        game = index.data(GameRole)
+        if game is None:
+            return
+        r = QRectF(option.rect).adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        # Sombra
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 90))
+        painter.drawRoundedRect(r.translated(0, 4), CARD_RADIUS, CARD_RADIUS)
+        # Fundo + capa
+        path = QPainterPath()
+        path.addRoundedRect(r, CARD_RADIUS, CARD_RADIUS)
+        painter.setClipPath(path)
+        painter.fillRect(r, QColor("#18181f"))
+        pix, text = self.cover_for(game)
+        if pix is not None:
+            painter.drawPixmap(r.toRect(), pix)
+        else:
+            painter.setPen(QColor("#aab"))
+            painter.drawText(r, Qt.AlignCenter, text)
+        painter.setClipping(False)
+        # Borda: dourada para favoritos, brilho azul no hover
+        if option.state & QStyle.State_MouseOver:
+            painter.setPen(QPen(QColor("#55aaff"), 3))
+        elif game.get("Favorito"):
+            painter.setPen(QPen(QColor("gold"), 3))
+        else:
+            painter.setPen(QPen(QColor("#444"), 1.5))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRoundedRect(r, CARD_RADIUS, CARD_RADIUS)
+        painter.restore()
+
+
+class GameGridView(QListView):
+    # (evento do mouse, jogo) — repassado para GameLibrary.handle_mouse
+    gameClicked = pyqtSignal(object, object)
+
+    def __init__(self, model, loader, group, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(256)
+        self.setUniformItemSizes(True)
+        self.setWrapping(True)
+        self.setSpacing(0)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(40)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+        self.viewport().setCursor(QCursor(Qt.PointingHandCursor))
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
+        self.delegate = CoverDelegate(loader, group, self)
+        self.setItemDelegate(self.delegate)
+        self.setModel(model)
+        model.modelAboutToBeReset.connect(self.delegate.reset)
+        # Pedidos de capas que saíram da tela são descartados; os visíveis são refeitos no próximo paint
+        self.verticalScrollBar().valueChanged.connect(self.delegate.reset)
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.pos())
+        if index.isValid():
+            self.gameClicked.emit(event, index.data(GameRole))
+            return
+        super().mousePressEvent(event)
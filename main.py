@@ -1,26 +1,50 @@
-import sys, os, json, shutil, datetime, requests
-import pandas as pd
+import sys, os, json, shutil, datetime, time
+STARTUP_T0 = time.perf_counter()   # referência do modo --startup-time
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
     QComboBox, QFileDialog, QGridLayout, QDialog, QTextEdit, QMessageBox, QScrollArea,
-    QMenu, QColorDialog, QInputDialog, QListWidgetItem, QGraphicsDropShadowEffect, QFrame
+    QMenu, QColorDialog, QInputDialog, QListWidgetItem, QFrame, QCheckBox
 )
-from PyQt5.QtGui import QPixmap, QCursor, QColor, QIcon, QFont, QMovie
-from PyQt5.QtCore import Qt, QSize, QTimer, QPoint
-
-import matplotlib.pyplot as plt
-from io import BytesIO
-from PIL import Image
-
-RAWG_API = "https://api.rawg.io/api/games"
-RAWG_KEY = ""
+from PyQt5.QtGui import QPixmap, QCursor, QFont, QMovie
+from PyQt5.QtCore import Qt, QSize, QTimer, QPoint, QObject, QEvent
+
+from backups import BackupStore
+from blobs import BlobStore, is_blob_ref, migrate_inline_covers
+from charts import ChartRenderer, chart_data
+from covers import CoverCache, CoverLoader
+from enrich import EnrichJob, enrichment_values
+from exporter import ExportJob, EXPORT_FORMATS, EXPORT_COLUMNS
+from icons import IconRegistry
+from importer import ImportJob, SteamScanJob
+from library_store import LibraryStore
+from library_view import GameListModel, GameGridView
+from media import ImageVariants, PROFILE_CACHE_DIR, THUMBS_DIR, FEED_THUMB_SIZE, FEED_PAGE
+from persistence import PersistWorker
+from prints import PrintIngestor
+from rawg import RawgClient
+from search import SearchIndex, SEARCH_FIELDS
+from stats import LibraryStats
+from steam import steam_roots
+from storage import open_storage, ensure_ids, make_game, GAME_FIELDS
+from tracing import TRACER, TRACE_PATH, span, traced
+
+# RAWG_API_URL permite apontar para o servidor local de testes (rawg_stub.py)
+RAWG_API = os.environ.get("RAWG_API_URL", "https://api.rawg.io/api/games")
+RAWG_KEY = os.environ.get("RAWG_KEY", "")
 
 PLATAFORMAS = ["Steam", "Epic Games", "PSN", "Xbox", "GOG", "Nintendo", "Outros"]
 STATUS_OPTIONS = ["Finalizado", "Jogando", "Não jogado", "Desejado"]
 BIB_PATH = "biblioteca.json"
+DB_PATH = "biblioteca.db"
+# "json" (padrão) ou "sqlite"; pode ser trocado pela variável de ambiente GAMESLOG_STORAGE
+STORAGE_BACKEND = os.environ.get("GAMESLOG_STORAGE", "json")
 BACKUP_DIR = "backups"
 PROFILE_PATH = "profile.json"
 PRINTS_DIR = "prints"
+SEARCH_DEBOUNCE_MS = 150
+# GAMESLOG_CHECK_STATS=1 compara as estatísticas incrementais com um recálculo completo ao abrir o resumo
+CHECK_STATS = os.environ.get("GAMESLOG_CHECK_STATS") == "1"
+TRACE_REFRESH_MS = 1000    # atualização do resumo de spans em Configurações
 
 THEMES = {
     "Steam": {"bg": "qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #19202a, stop:1 #293b4a)", "fg": "#f3f6fa", "btn": "#223349", "input": "#212735", "accent": "#66c0f4"},
@@ -49,39 +73,6 @@ MENU_TOP = [
     ("Perfil", ICON_URLS["Perfil"])
 ]
 
-def icon_from_url(url):
-    try:
-        response = requests.get(url)
-        pix = QPixmap()
-        pix.loadFromData(response.content)
-        return QIcon(pix)
-    except Exception:
-        return QIcon()
-
-def add_shadow(widget):
-    shadow = QGraphicsDropShadowEffect()
-    shadow.setBlurRadius(22)
-    shadow.setColor(QColor(0, 0, 0, 140))
-    shadow.setOffset(0, 4)
-    widget.setGraphicsEffect(shadow)
-
-def crop_and_fit(img_data, size=(180, 260)):
-    try:
-        image = Image.open(BytesIO(img_data)).convert('RGB')
-        iw, ih = image.size
-        tw, th = size
-        scale = max(tw / iw, th / ih)
-        nw, nh = int(iw * scale), int(ih * scale)
-        image = image.resize((nw, nh), Image.LANCZOS)
-        left = (nw - tw) // 2
-        top = (nh - th) // 2
-        image = image.crop((left, top, left + tw, top + th))
-        output = BytesIO()
-        image.save(output, format="PNG")
-        return output.getvalue()
-    except Exception:
-        return None
-
 def ensure_dirs():
     if not os.path.exists(PRINTS_DIR): os.makedirs(PRINTS_DIR)
 
@@ -104,6 +95,20 @@ class Toast(QWidget):
         self.move(scr.center() - self.rect().center() + QPoint(0, 170))
         QTimer.singleShot(duration, self.close)
 
+class FirstPaint(QObject):
+    # Chama callback uma única vez, logo depois da primeira pintura do widget
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self.callback is not None:
+            callback, self.callback = self.callback, None
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, callback)
+        return False
+
 class SplashScreen(QWidget):
     def __init__(self):
         super().__init__()
@@ -150,12 +155,12 @@ class AddGameDialog(QDialog):
             grid.addWidget(widget, i, 1)
             self.inputs[label] = widget
         self.uploaded_img_path = None
-        self.img_btn = QPushButton(icon_from_url(ICON_URLS["Upload"]), "Upload Capa")
+        self.img_btn = parent.icons.apply(QPushButton("Upload Capa"), "Upload")
         self.img_btn.clicked.connect(self.upload_image)
         grid.addWidget(self.img_btn, 7, 2)
         layout.addLayout(grid)
         btn_box = QHBoxLayout()
-        self.add_btn = QPushButton(icon_from_url(ICON_URLS["Adicionar"]), "Adicionar")
+        self.add_btn = parent.icons.apply(QPushButton("Adicionar"), "Adicionar")
         self.add_btn.clicked.connect(self.do_add)
         btn_box.addWidget(self.add_btn)
         btn_box.addStretch()
@@ -190,9 +195,10 @@ class ProfileEditor(QDialog):
         self.avatar_label = QLabel()
         self.avatar_label.setFixedSize(92, 92)
         self.avatar_label.setStyleSheet("border-radius: 46px; background: #222;")
-        if profile.get("avatar"):
-            pix = QPixmap(profile["avatar"])
-            self.avatar_label.setPixmap(pix.scaled(92, 92, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation))
+        self.images = parent.profile_images
+        pix = self.images.get(profile.get("avatar"), (92, 92), fill=True)
+        if pix is not None:
+            self.avatar_label.setPixmap(pix)
         av_box.addWidget(self.avatar_label)
         self.avatar_btn = QPushButton("Alterar Foto")
         self.avatar_btn.clicked.connect(self.upload_avatar)
@@ -221,8 +227,7 @@ class ProfileEditor(QDialog):
         fname, _ = QFileDialog.getOpenFileName(self, "Escolha avatar", "", "Imagens (*.png *.jpg *.jpeg)")
         if fname:
             self.profile["avatar"] = fname
-            pix = QPixmap(fname)
-            self.avatar_label.setPixmap(pix.scaled(92, 92, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation))
+            self.avatar_label.setPixmap(self.images.get(fname, (92, 92), fill=True) or QPixmap())
 
     def remove_avatar(self):
         self.profile["avatar"] = ""
@@ -268,13 +273,87 @@ class PostDialog(QDialog):
         self.add_cb(self.text_input.toPlainText(), self.print_path)
         self.accept()
 
+class ExportDialog(QDialog):
+    ESCOPOS = ["Biblioteca inteira", "Resultado da busca atual", "Favoritos"]
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setWindowTitle("Exportar Biblioteca")
+        self.setFixedWidth(560)
+        layout = QVBoxLayout(self)
+        grid = QGridLayout()
+        grid.addWidget(QLabel("Formato:"), 0, 0)
+        self.fmt = QComboBox()
+        self.fmt.addItems(list(EXPORT_FORMATS))
+        grid.addWidget(self.fmt, 0, 1)
+        grid.addWidget(QLabel("Jogos:"), 1, 0)
+        self.escopo = QComboBox()
+        self.escopo.addItems(self.ESCOPOS)
+        grid.addWidget(self.escopo, 1, 1)
+        layout.addLayout(grid)
+        layout.addWidget(QLabel("Colunas:"))
+        cols = QGridLayout()
+        self.checks = {}
+        for i, field in enumerate(GAME_FIELDS):
+            check = QCheckBox(field)
+            check.setChecked(field in EXPORT_COLUMNS)
+            cols.addWidget(check, i // 2, i % 2)
+            self.checks[field] = check
+        layout.addLayout(cols)
+        btn_box = QHBoxLayout()
+        ok = QPushButton("Exportar")
+        ok.clicked.connect(self.accept)
+        btn_box.addWidget(ok)
+        btn_box.addStretch()
+        cancel = QPushButton("Cancelar")
+        cancel.clicked.connect(self.reject)
+        btn_box.addWidget(cancel)
+        layout.addLayout(btn_box)
+
+    def values(self):
+        columns = [f for f, check in self.checks.items() if check.isChecked()]
+        return EXPORT_FORMATS[self.fmt.currentText()], columns, self.escopo.currentIndex()
+
 class GameLibrary(QWidget):
+    @traced("ui.build")
     def __init__(self):
         super().__init__()
         ensure_dirs()
         self.setWindowTitle("GAMESLOG by Maiden")
         self.setGeometry(60, 35, 1400, 900)
-        self.games = []
+        # Toda mutação passa pelo LibraryStore; self.games é a mesma lista, só para leitura
+        self.library = LibraryStore()
+        self.games = self.library.games
+        self.library.subscribe(self.on_library_change)
+        # Favoritar, editar e remover corrigem só o card afetado nas grades (patch_*); o resto redesenha
+        self.lib_view = self.library.view("biblioteca", patch=self.patch_library)
+        self.fav_view = self.library.view("favoritos", match=lambda g: g.get("Favorito"), patch=self.patch_favs)
+        self.profile_view = self.library.view("perfil", fields={"Nome", "Status"}, match=lambda g: g.get("Status") == "Finalizado")
+        # Ícones locais (icons/ ou cache/icons/); os que faltam são baixados uma vez, em segundo plano
+        self.icons = IconRegistry(ICON_URLS, parent=self)
+        self.blobs = BlobStore()
+        self.covers = CoverCache(blobs=self.blobs)
+        self.cover_loader = CoverLoader(self.covers, parent=self)
+        self.search_index = SearchIndex()
+        self.stats = LibraryStats()
+        self.charts = ChartRenderer(self)
+        self.charts.rendered.connect(self.on_chart_rendered)
+        self.charts.failed.connect(self.on_chart_failed)
+        self.charts.exported.connect(lambda path, erro: self.show_toast(f"Falha ao exportar: {erro}" if erro else "Gráficos exportados!"))
+        self.chart_key = None
+        self.profile_images = ImageVariants(PROFILE_CACHE_DIR, parent=self)
+        self.feed_thumbs = ImageVariants(THUMBS_DIR, parent=self)
+        self.prints = PrintIngestor(self.feed_thumbs, PRINTS_DIR, parent=self)
+        self.feed_dirty = True
+        self.feed_shown = 0
+        self.backups = BackupStore(BACKUP_DIR)
+        self.storage = open_storage(STORAGE_BACKEND, BIB_PATH, DB_PATH)
+        self.writer = PersistWorker(self.storage, self.backups, PROFILE_PATH, lambda: self.games, parent=self)
+        self.rawg = RawgClient(RAWG_KEY, RAWG_API)
+        self.enrich_job = None
+        self.import_job = None
+        self.steam_job = None
+        self.export_job = None
         self.theme = "Steam"
         self.profile = {
             "nickname": "Maiden",
@@ -286,11 +365,13 @@ class GameLibrary(QWidget):
         self.setup_ui()
         self.load_library()
         self.load_profile()
+        self.backups.prune_async()
 
     def setup_ui(self):
         font = QFont('Segoe UI', 13)
         QApplication.instance().setFont(font)
-        self.setStyleSheet(self.generate_stylesheet())
+        with span("ui.stylesheet"):
+            self.setStyleSheet(self.generate_stylesheet())
 
         layout = QVBoxLayout(self)
         self.topbar = QWidget()
@@ -299,9 +380,9 @@ class GameLibrary(QWidget):
         topbar_layout.setContentsMargins(10, 6, 10, 6)
         topbar_layout.setSpacing(30)
         self.menu_btns = []
-        for idx, (name, icon_url) in enumerate(MENU_TOP):
+        for idx, (name, _) in enumerate(MENU_TOP):
             btn = QPushButton(name)
-            btn.setIcon(icon_from_url(icon_url))
+            self.icons.apply(btn, name)
             btn.setIconSize(QSize(26, 26))
             btn.setCheckable(True)
             btn.setCursor(QCursor(Qt.PointingHandCursor))
@@ -315,6 +396,11 @@ class GameLibrary(QWidget):
             topbar_layout.addWidget(btn)
         self.menu_btns[0].setChecked(True)
         topbar_layout.addStretch()
+        self.save_status = QLabel()
+        self.save_status.setStyleSheet("color:#8fa3b8; font-size:14px; background:transparent;")
+        self.writer.pendingChanged.connect(lambda p: self.save_status.setText("Salvando..." if p else ""))
+        self.writer.failed.connect(lambda e: self.save_status.setText(f"Falha ao salvar ({e}); tentando de novo..."))
+        topbar_layout.addWidget(self.save_status)
         layout.addWidget(self.topbar)
 
         self.pages = []
@@ -324,7 +410,7 @@ class GameLibrary(QWidget):
         vbox = QVBoxLayout(self.page_biblioteca)
         vbox.setSpacing(18)
         # Botão Add (MODAL)
-        add_btn = QPushButton(icon_from_url(ICON_URLS["Adicionar"]), "Adicionar Jogo")
+        add_btn = self.icons.apply(QPushButton("Adicionar Jogo"), "Adicionar")
         add_btn.setFixedWidth(180)
         add_btn.setStyleSheet("QPushButton {background:#66c0f4; color:#fff; font-weight:600; font-size:19px; border-radius:11px; padding:9px 0;}")
         add_btn.clicked.connect(self.open_add_game)
@@ -333,43 +419,67 @@ class GameLibrary(QWidget):
         # Busca
         search_layout = QHBoxLayout()
         self.input_search = QLineEdit(); self.input_search.setPlaceholderText("Pesquisar")
-        self.input_search.textChanged.connect(self.refresh_library)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.refresh_library)
+        self.input_search.textChanged.connect(lambda _: self.search_timer.start())
         search_layout.addWidget(self.input_search)
         vbox.addLayout(search_layout)
         # Grade
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.library_widget = QWidget()
-        self.library_grid = QGridLayout(self.library_widget)
-        self.scroll.setWidget(self.library_widget)
-        vbox.addWidget(self.scroll)
+        self.library_model = GameListModel(lambda g: (
+            f"Nota pessoal: {g['Nota pessoal']}\nStatus: {g['Status']}"
+            f"\nClique: Detalhes\nDireito: Favoritar/Remover\nMeio: Editar"
+        ))
+        self.library_view = GameGridView(self.library_model, self.cover_loader, "library")
+        self.library_view.gameClicked.connect(self.handle_mouse)
+        vbox.addWidget(self.library_view)
         self.pages.append(self.page_biblioteca)
 
         # ---------- Favoritos ----------
         self.page_fav = QWidget()
         vbox_fav = QVBoxLayout(self.page_fav)
-        self.scroll_fav = QScrollArea()
-        self.scroll_fav.setWidgetResizable(True)
-        self.widget_fav = QWidget()
-        self.grid_fav = QGridLayout(self.widget_fav)
-        self.scroll_fav.setWidget(self.widget_fav)
-        vbox_fav.addWidget(self.scroll_fav)
+        self.favs_model = GameListModel(lambda g: "Clique: Detalhes\nDireito: Desfavoritar\nMeio: Editar")
+        self.favs_view = GameGridView(self.favs_model, self.cover_loader, "favs")
+        self.favs_view.gameClicked.connect(self.handle_mouse)
+        vbox_fav.addWidget(self.favs_view)
         self.pages.append(self.page_fav)
 
         # ---------- Resumo ----------
         self.page_resumo = QWidget()
         vbox_resumo = QVBoxLayout(self.page_resumo)
-        self.resumo_btn = QPushButton(icon_from_url(ICON_URLS["Resumo/Gráficos"]), "Ver Gráficos e Resumo")
-        self.resumo_btn.clicked.connect(self.show_summary)
-        vbox_resumo.addWidget(self.resumo_btn)
+        resumo_top = QHBoxLayout()
+        self.resumo_info = QLabel()
+        resumo_top.addWidget(self.resumo_info)
+        resumo_top.addStretch()
+        self.chart_export_btn = self.icons.apply(QPushButton("Exportar Gráficos (PNG/SVG)"), "Resumo/Gráficos")
+        self.chart_export_btn.clicked.connect(self.export_charts)
+        resumo_top.addWidget(self.chart_export_btn)
+        vbox_resumo.addLayout(resumo_top)
+        self.chart_lbl = QLabel()
+        self.chart_lbl.setAlignment(Qt.AlignCenter)
+        self.chart_lbl.setMinimumSize(1, 1)
+        vbox_resumo.addWidget(self.chart_lbl, 1)
         self.pages.append(self.page_resumo)
 
         # ---------- Exportar ----------
         self.page_export = QWidget()
         vbox_export = QVBoxLayout(self.page_export)
-        self.export_btn = QPushButton(icon_from_url(ICON_URLS["Exportar"]), "Exportar Excel")
-        self.export_btn.clicked.connect(self.export_excel)
+        self.export_btn = self.icons.apply(QPushButton("Exportar (CSV/Excel/Parquet)"), "Exportar")
+        self.export_btn.clicked.connect(self.export_games)
         vbox_export.addWidget(self.export_btn)
+        self.export_status = QLabel()
+        self.export_status.setStyleSheet("color:#8fa3b8; font-size:14px; background:transparent;")
+        vbox_export.addWidget(self.export_status)
+        self.import_btn = self.icons.apply(QPushButton("Importar CSV/Excel/JSON"), "Upload")
+        self.import_btn.clicked.connect(self.import_games)
+        vbox_export.addWidget(self.import_btn)
+        self.import_status = QLabel()
+        self.import_status.setStyleSheet("color:#8fa3b8; font-size:14px; background:transparent;")
+        vbox_export.addWidget(self.import_status)
+        self.steam_btn = QPushButton("Importar Jogos Instalados da Steam")
+        self.steam_btn.clicked.connect(self.import_steam)
+        vbox_export.addWidget(self.steam_btn)
         self.pages.append(self.page_export)
 
         # ---------- Configurações (temas) ----------
@@ -381,6 +491,32 @@ class GameLibrary(QWidget):
             btn.clicked.connect(lambda _, n=tname: self.set_theme(n))
             vbox_cfg.addWidget(btn)
             self.theme_btns.append(btn)
+        self.restore_btn = QPushButton("Restaurar Backup")
+        self.restore_btn.clicked.connect(self.restore_backup)
+        vbox_cfg.addWidget(self.restore_btn)
+        self.enrich_btn = QPushButton("Retomar Metadados (RAWG)" if EnrichJob.has_state() else "Completar Metadados (RAWG)")
+        self.enrich_btn.clicked.connect(self.toggle_enrich)
+        vbox_cfg.addWidget(self.enrich_btn)
+        self.enrich_status = QLabel()
+        self.enrich_status.setStyleSheet("color:#8fa3b8; font-size:14px; background:transparent;")
+        vbox_cfg.addWidget(self.enrich_status)
+        # Rastreamento de desempenho (também liga com GAMESLOG_TRACE=1)
+        self.trace_chk = QCheckBox("Rastrear desempenho")
+        self.trace_chk.setChecked(TRACER.enabled)
+        self.trace_chk.toggled.connect(self.toggle_trace)
+        vbox_cfg.addWidget(self.trace_chk)
+        self.trace_export_btn = QPushButton("Exportar Trace (Chrome/Perfetto)")
+        self.trace_export_btn.clicked.connect(self.export_trace)
+        vbox_cfg.addWidget(self.trace_export_btn)
+        self.trace_summary = QLabel()
+        self.trace_summary.setTextFormat(Qt.PlainText)
+        self.trace_summary.setStyleSheet("color:#8fa3b8; font-family:monospace; font-size:13px; background:transparent;")
+        vbox_cfg.addWidget(self.trace_summary)
+        self.trace_timer = QTimer(self)
+        self.trace_timer.setInterval(TRACE_REFRESH_MS)
+        self.trace_timer.timeout.connect(self.refresh_trace_summary)
+        if TRACER.enabled:
+            self.trace_timer.start()
         vbox_cfg.addStretch()
         self.pages.append(self.page_config)
 
@@ -438,9 +574,13 @@ class GameLibrary(QWidget):
         self.prints_feed = QVBoxLayout()
         prints_feed_widget = QWidget()
         prints_feed_widget.setLayout(self.prints_feed)
+        self.prints_feed.addStretch()
         scroll_prints = QScrollArea()
         scroll_prints.setWidgetResizable(True)
         scroll_prints.setWidget(prints_feed_widget)
+        # Próxima página de posts ao chegar perto do fim da rolagem
+        bar = scroll_prints.verticalScrollBar()
+        bar.valueChanged.connect(lambda v: self.load_more_prints() if v >= bar.maximum() - 80 else None)
         vbox_profile.addWidget(scroll_prints)
         self.add_print_btn = QPushButton("Adicionar Post/Print")
         self.add_print_btn.clicked.connect(self.add_print_post)
@@ -471,9 +611,19 @@ class GameLibrary(QWidget):
             btn.setChecked(i == idx)
         for i, page in enumerate(self.page_stack):
             page.setVisible(i == idx)
-        if idx == 0: self.refresh_library()
-        if idx == 1: self.refresh_favs()
-        if idx == 5: self.refresh_profile()
+        # Só redesenha se alguma mudança afetou a aba desde o último desenho
+        if idx == 0 and self.lib_view.dirty: self.refresh_library()
+        if idx == 1 and self.fav_view.dirty: self.refresh_favs()
+        if idx == 2: self.refresh_summary()
+        if idx == 5:
+            self.refresh_wallpaper()
+            if self.profile_view.dirty: self.refresh_profile_stats()
+
+    def refresh_views(self):
+        # Depois de uma mutação: só a aba visível é redesenhada (se afetada); as outras ficam para quando abrirem
+        if not self.page_biblioteca.isHidden() and self.lib_view.dirty: self.refresh_library()
+        if not self.page_fav.isHidden() and self.fav_view.dirty: self.refresh_favs()
+        if not self.page_profile.isHidden() and self.profile_view.dirty: self.refresh_profile_stats()
 
     # ----------- Biblioteca ---------
     def open_add_game(self):
@@ -486,14 +636,10 @@ class GameLibrary(QWidget):
         if not nome:
             self.show_toast("Digite o nome do jogo!")
             return
-        if img_path:
-            with open(img_path, "rb") as f:
-                img_data = f.read()
-            img_base64 = img_data.hex()
-        else:
-            img_base64 = None
-        dados_jogo = self.fetch_game_data(nome, plataforma) if not img_base64 else {}
-        game = {
+        # Capa enviada vai para o blob store; no JSON fica só a referência "blob:<sha256>"
+        img_ref = self.blobs.put_file(img_path) if img_path else None
+        dados_jogo = self.fetch_game_data(nome, plataforma) if not img_ref else {}
+        game = make_game({
             "Nome": dados_jogo.get('nome', nome),
             "Plataforma/Loja": plataforma,
             "Data de compra": vals["Data de compra"].strip(),
@@ -501,123 +647,172 @@ class GameLibrary(QWidget):
             "Nº comprovante": vals["Nº comprovante"].strip(),
             "Nota pessoal": vals["Nota pessoal"].strip(),
             "Status": vals["Status"],
-            "Imagem": img_base64 if img_base64 else dados_jogo.get('imagem'),
-            "Imagem_manual": bool(img_base64),
+            "Imagem": img_ref if img_ref else dados_jogo.get('imagem'),
+            "Imagem_manual": bool(img_ref),
             "Gênero": dados_jogo.get('genero', ''),
             "Descrição": dados_jogo.get('descricao', ''),
             "Data lançamento": dados_jogo.get('data_lancamento', ''),
             "Desenvolvedor": dados_jogo.get('dev', ''),
             "Link": dados_jogo.get('link', ''),
-            "Favorito": False,
             "Anotações": vals["Anotações"].strip()
-        }
-        self.games.append(game)
-        self.save_library()
-        self.refresh_library()
+        })
+        self.library.add(game)
+        self.refresh_views()
         self.show_toast("Jogo adicionado com sucesso!")
 
     def fetch_game_data(self, nome, plataforma):
         if not RAWG_KEY:
             return {}
         self.show_toast("Buscando detalhes do jogo...", 1100)
-        params = {"key": RAWG_KEY, "search": nome, "page_size": 1}
-        r = requests.get(RAWG_API, params=params)
-        if r.status_code == 200 and r.json()['results']:
-            game = r.json()['results'][0]
-            descricao = self.get_description(game['id'])
-            genero = ', '.join([g['name'] for g in game.get('genres', [])])
-            imagem = game.get('background_image', '')
-            data_lanc = game.get('released', '')
-            dev = ', '.join([d['name'] for d in game.get('developers', [])]) if 'developers' in game else ""
-            link = f"https://rawg.io/games/{game['slug']}"
-            return {
-                'nome': game['name'],
-                'imagem': imagem,
-                'genero': genero,
-                'descricao': descricao,
-                'data_lancamento': data_lanc,
-                'dev': dev,
-                'link': link
-            }
-        return {}
-
-    def get_description(self, game_id):
+        try:
+            return self.rawg.game_data(nome)
+        except Exception:
+            return {}
+
+    # ----------- Metadados em lote -----------
+    def toggle_enrich(self):
+        if self.enrich_job is not None and self.enrich_job.running():
+            self.enrich_job.cancel()
+            self.enrich_btn.setEnabled(False)
+            self.enrich_status.setText("Cancelando...")
+            return
         if not RAWG_KEY:
-            return ""
-        url = f"{RAWG_API}/{game_id}"
-        r = requests.get(url, params={"key": RAWG_KEY})
-        if r.status_code == 200:
-            desc = r.json().get('description_raw', '')
-            return desc if desc else ""
-        return ""
+            self.show_toast("Configure a RAWG_KEY para buscar metadados.")
+            return
+        job = EnrichJob(self.rawg, self.games, parent=self)
+        if not job.todo:
+            self.show_toast("Todos os jogos já têm metadados!")
+            return
+        job.progress.connect(lambda feitos, total: self.enrich_status.setText(f"Metadados: {feitos}/{total}"))
+        job.batchReady.connect(self.apply_enrich_batch)
+        job.finished.connect(self.enrich_finished)
+        self.enrich_job = job
+        self.enrich_btn.setText("Cancelar Metadados")
+        job.start()
+
+    def apply_enrich_batch(self, results, ids):
+        for game_id, dados in results:
+            game = self.library.get(game_id)
+            if game is not None:
+                self.library.update(game, enrichment_values(game, dados))
+        self.refresh_views()
+        # Só agora (jogos já marcados no PersistWorker) o lote conta como feito para retomar
+        if self.enrich_job is not None:
+            self.enrich_job.mark_done(ids)
+
+    def enrich_finished(self, completo):
+        if completo and self.enrich_job is not None:
+            self.enrich_job.clear_state()
+        self.enrich_job = None
+        self.enrich_btn.setEnabled(True)
+        self.enrich_btn.setText("Completar Metadados (RAWG)" if completo else "Retomar Metadados (RAWG)")
+        self.enrich_status.setText("Metadados completos!" if completo else "Pausado; dá para retomar depois.")
+
+    # ----------- Rastreamento ---------
+    def toggle_trace(self, on):
+        TRACER.set_enabled(on)
+        if on:
+            self.trace_timer.start()
+        else:
+            self.trace_timer.stop()
+        self.refresh_trace_summary()
 
-    def refresh_library(self):
-        for i in reversed(range(self.library_grid.count())):
-            widget = self.library_grid.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-        filtro = self.input_search.text().lower()
-        jogos = [g for g in self.games if
-                 filtro in g['Nome'].lower()
-                 or filtro in g['Plataforma/Loja'].lower()
-                 or filtro in g.get('Gênero', '').lower()
-                 or filtro in g.get('Status', '').lower()]
-        colunas = 6
-        for idx, game in enumerate(jogos):
-            row, col = divmod(idx, colunas)
-            capa = QLabel()
-            capa.setFixedSize(QSize(180, 260))
-            capa.setObjectName("capa")
-            fav_borda = "3px solid gold;" if game.get("Favorito") else "1.5px solid #444;"
-            capa.setStyleSheet(f"""
-                border-radius:17px;
-                border:{fav_borda}
-                background:#18181f;
-                margin:11px;
-            """)
-            add_shadow(capa)
-
-            def enter(e, c=capa):
-                c.setStyleSheet(c.styleSheet() + "box-shadow: 0 0 17px #5af,0 0 1px #000;")
-            def leave(e, c=capa):
-                c.setStyleSheet(c.styleSheet().replace("box-shadow: 0 0 17px #5af,0 0 1px #000;", ""))
-            capa.enterEvent = enter
-            capa.leaveEvent = leave
-
-            if game.get("Imagem_manual"):
-                try:
-                    img_data = bytes.fromhex(game["Imagem"])
-                    crop = crop_and_fit(img_data, (180, 260))
-                    if crop:
-                        pix = QPixmap()
-                        pix.loadFromData(crop)
-                        capa.setPixmap(pix)
-                    else:
-                        capa.setText("Sem imagem")
-                except:
-                    capa.setText("Sem imagem")
-            elif game['Imagem']:
-                try:
-                    img_data = requests.get(game['Imagem'], timeout=4).content
-                    crop = crop_and_fit(img_data, (180, 260))
-                    if crop:
-                        pix = QPixmap()
-                        pix.loadFromData(crop)
-                        capa.setPixmap(pix)
-                    else:
-                        capa.setText("Sem imagem")
-                except:
-                    capa.setText("Sem imagem")
+    def refresh_trace_summary(self):
+        linhas = [f"{nome[:22]:<22} {n:>7}x  total {total:9.1f} ms  média {media:7.2f}  máx {maximo:8.1f}"
+                  for nome, n, total, media, maximo in TRACER.summary()]
+        self.trace_summary.setText("\n".join(linhas) if linhas else ("Nenhum span ainda." if TRACER.enabled else ""))
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar Trace", "gameslog-trace.json", "Trace JSON (*.json)")
+        if not path: return
+        try:
+            n = TRACER.export(path)
+        except OSError as e:
+            self.show_toast(f"Falha ao exportar trace: {e}")
+            return
+        self.show_toast(f"Trace exportado ({n} spans)! Abra em ui.perfetto.dev")
+
+    def set_cover(self, label, game, size, group):
+        # Placeholder imediato; a capa entra quando o loader terminar
+        def apply(pix, lbl=label):
+            if pix:
+                lbl.setPixmap(pix)
             else:
-                capa.setText("Sem imagem")
+                lbl.setText("Sem imagem")
+        label.setAlignment(Qt.AlignCenter)
+        if not game.get("Imagem"):
+            label.setText("Sem imagem")
+            return
+        label.setText("Carregando...")
+        pix = self.cover_loader.request(game, size, apply, group)
+        if pix:
+            label.setPixmap(pix)
 
-            capa.setCursor(QCursor(Qt.PointingHandCursor))
-            capa.setToolTip(
-                f"Nota pessoal: {game['Nota pessoal']}\nStatus: {game['Status']}"
-                f"\nClique: Detalhes\nDireito: Favoritar/Remover\nMeio: Editar"
-            )
-            capa.mousePressEvent = lambda event, g=game: self.handle_mouse(event, g)
-            self.library_grid.addWidget(capa, row, col)
+    def refresh_library(self):
+        filtro = self.input_search.text()
+        with span("search", query=filtro):
+            jogos = self.search_index.search(filtro) if filtro.strip() else self.games
+        with span("ui.refresh_library", rows=len(jogos)):
+            self.library_model.set_games(jogos)
+        self.lib_view.mark_synced()
+
+    def patch_library(self, change):
+        filtrado = bool(self.input_search.text().strip())
+        if change.kind == "removed":
+            for game in change.games:
+                self.library_model.remove_game(game)
+            return True
+        if filtrado and (change.kind == "added" or change.fields & {f for f, _ in SEARCH_FIELDS}):
+            # com busca ativa, a mudança pode mexer em quem aparece e na ordem
+            return False
+        if change.kind == "added":
+            self.library_model.append_games(change.games)
+            return True
+        if change.kind == "changed":
+            for game in change.games:
+                self.library_model.refresh_game(game)
+            return True
+        return False
+
+    def patch_favs(self, change):
+        if change.kind == "removed":
+            for game in change.games:
+                self.favs_model.remove_game(game)
+            return True
+        if change.kind != "changed":
+            return False
+        for game in change.games:
+            if game.get("Favorito"):
+                if not self.favs_model.refresh_game(game):
+                    # favorito novo: a posição depende da ordem da biblioteca
+                    return False
+            else:
+                self.favs_model.remove_game(game)
+        return True
+
+    def on_library_change(self, change):
+        # Índices, estatísticas e gravação acompanham cada mutação do LibraryStore
+        if change.kind == "reset":
+            self.search_index.rebuild(self.games)
+            self.stats.rebuild(self.games)
+            return
+        if change.kind == "added" or "Imagem" in change.fields:
+            # Capa nova: card e tela de detalhes gerados já, num decode só
+            self.cover_loader.prerender(change.games)
+        for game in change.games:
+            if change.kind == "added":
+                self.search_index.add(game)
+                self.stats.add(game)
+                self.save_game(game)
+            elif change.kind == "changed":
+                self.search_index.update(game)
+                self.stats.update(game)
+                self.save_game(game)
+            elif change.kind == "removed":
+                self.search_index.remove(game)
+                self.stats.remove(game)
+                self.covers.invalidate(game)
+                self.writer.mark_deleted(game)
 
     def handle_mouse(self, event, game):
         if event.button() == Qt.LeftButton:
@@ -633,10 +828,8 @@ class GameLibrary(QWidget):
         rem_action = menu.addAction("Remover")
         action = menu.exec_(QCursor.pos())
         if action == fav_action:
-            game["Favorito"] = not game.get("Favorito", False)
-            self.save_library()
-            self.refresh_library()
-            self.refresh_favs()
+            self.library.update(game, {"Favorito": not game.get("Favorito", False)})
+            self.refresh_views()
         elif action == rem_action:
             self.remove_game(game)
 
@@ -645,28 +838,11 @@ class GameLibrary(QWidget):
         dlg.setWindowTitle(game['Nome'])
         dlg.resize(800, 650)
         vbox = QVBoxLayout()
-        if game.get("Imagem_manual"):
-            try:
-                img_data = bytes.fromhex(game["Imagem"])
-                crop = crop_and_fit(img_data, (220, 320))
-                if crop:
-                    pix = QPixmap()
-                    pix.loadFromData(crop)
-                    lbl_capa = QLabel()
-                    lbl_capa.setPixmap(pix)
-                    vbox.addWidget(lbl_capa, alignment=Qt.AlignCenter)
-            except: pass
-        elif game['Imagem']:
-            try:
-                img_data = requests.get(game['Imagem'], timeout=4).content
-                crop = crop_and_fit(img_data, (220, 320))
-                if crop:
-                    pix = QPixmap()
-                    pix.loadFromData(crop)
-                    lbl_capa = QLabel()
-                    lbl_capa.setPixmap(pix)
-                    vbox.addWidget(lbl_capa, alignment=Qt.AlignCenter)
-            except: pass
+        if game.get('Imagem'):
+            lbl_capa = QLabel()
+            lbl_capa.setFixedSize(QSize(220, 320))
+            self.set_cover(lbl_capa, game, (220, 320), "details")
+            vbox.addWidget(lbl_capa, alignment=Qt.AlignCenter)
         desc = QTextEdit()
         desc.setReadOnly(True)
         desc.setHtml(f"""
@@ -688,15 +864,14 @@ class GameLibrary(QWidget):
         vbox.addWidget(desc)
         dlg.setLayout(vbox)
         dlg.exec_()
+        self.cover_loader.cancel("details")
 
     def remove_game(self, game):
         reply = QMessageBox.question(self, 'Remover Jogo',
             f"Remover {game['Nome']} da biblioteca?", QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
-            self.games.remove(game)
-            self.save_library()
-            self.refresh_library()
-            self.refresh_favs()
+            self.library.remove(game)
+            self.refresh_views()
             self.show_toast("Removido!")
 
     def edit_game(self, game):
@@ -708,129 +883,208 @@ class GameLibrary(QWidget):
             ("Status", game["Status"]),
             ("Anotações", game["Anotações"])
         ]
+        vals = {}
         for campo, valor in campos:
             if campo == "Status":
                 status, ok = QInputDialog.getItem(self, "Editar Status", "Status:", STATUS_OPTIONS, STATUS_OPTIONS.index(valor), False)
-                if ok: game["Status"] = status
+                if ok: vals["Status"] = status
             else:
                 novo, ok = QInputDialog.getText(self, f"Editar {campo}", f"{campo}:", text=valor)
-                if ok: game[campo] = novo
-        self.save_library()
-        self.refresh_library()
+                if ok: vals[campo] = novo
+        self.library.update(game, vals)
+        self.refresh_views()
         self.show_toast("Alteração salva!")
 
+    @traced("ui.refresh_favs")
     def refresh_favs(self):
-        for i in reversed(range(self.grid_fav.count())):
-            widget = self.grid_fav.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-        favs = [g for g in self.games if g.get("Favorito")]
-        colunas = 5
-        for idx, game in enumerate(favs):
-            row, col = divmod(idx, colunas)
-            capa = QLabel()
-            capa.setFixedSize(QSize(180, 260))
-            capa.setStyleSheet("""
-                border-radius:16px;
-                border:3px solid gold;
-                background:#181818;
-                margin:10px;
-            """)
-            add_shadow(capa)
-            if game.get("Imagem_manual"):
-                try:
-                    img_data = bytes.fromhex(game["Imagem"])
-                    crop = crop_and_fit(img_data, (180, 260))
-                    if crop:
-                        pix = QPixmap()
-                        pix.loadFromData(crop)
-                        capa.setPixmap(pix)
-                except:
-                    capa.setText("Sem imagem")
-            elif game['Imagem']:
-                try:
-                    img_data = requests.get(game['Imagem'], timeout=4).content
-                    crop = crop_and_fit(img_data, (180, 260))
-                    if crop:
-                        pix = QPixmap()
-                        pix.loadFromData(crop)
-                        capa.setPixmap(pix)
-                except:
-                    capa.setText("Sem imagem")
-            else:
-                capa.setText("Sem imagem")
-            capa.setCursor(QCursor(Qt.PointingHandCursor))
-            capa.setToolTip("Clique: Detalhes\nDireito: Desfavoritar\nMeio: Editar")
-            capa.mousePressEvent = lambda event, g=game: self.handle_mouse(event, g)
-            self.grid_fav.addWidget(capa, row, col)
-
-    def export_excel(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Salvar Planilha", "", "Excel Files (*.xlsx)")
+        self.favs_model.set_games(self.favorites())
+        self.fav_view.mark_synced()
+
+    def export_games(self):
+        if self.export_job is not None:
+            self.export_job.cancel()
+            self.export_status.setText("Cancelando...")
+            return
+        dlg = ExportDialog(self)
+        if not dlg.exec_():
+            return
+        fmt, columns, escopo = dlg.values()
+        if not columns:
+            self.show_toast("Escolha ao menos uma coluna.")
+            return
+        if escopo == 1:
+            filtro = self.input_search.text()
+            jogos = self.search_index.search(filtro) if filtro.strip() else self.games
+        elif escopo == 2:
+            jogos = self.favorites()
+        else:
+            jogos = self.games
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar Exportação", f"biblioteca.{fmt}", f"{fmt.upper()} (*.{fmt})")
         if not path: return
-        df = pd.DataFrame(self.games)
-        df.to_excel(path, index=False)
-        self.show_toast(f"Planilha salva!")
+        if not path.lower().endswith("." + fmt):
+            path += "." + fmt
+        job = ExportJob(path, fmt, jogos, columns, parent=self)
+        job.progress.connect(lambda feitas, total: self.export_status.setText(f"Exportando: {feitas}/{total}"))
+        job.finished.connect(self.export_finished)
+        self.export_job = job
+        self.export_btn.setText("Cancelar Exportação")
+        job.start()
+
+    def export_finished(self, linhas, erro):
+        self.export_job = None
+        self.export_btn.setText("Exportar (CSV/Excel/Parquet)")
+        if erro == "cancelado":
+            self.export_status.setText("Exportação cancelada.")
+        elif erro:
+            self.export_status.setText(f"Falha na exportação: {erro}")
+        else:
+            self.export_status.setText("")
+            self.show_toast(f"{linhas} jogos exportados!")
 
-    def show_summary(self):
-        if not self.games:
+    def import_games(self):
+        if self.import_job is not None:
+            self.import_job.cancel()
+            self.import_status.setText("Cancelando...")
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Importar Jogos", "",
+            "Planilhas e JSON (*.csv *.xlsx *.json *.jsonl);;Todos os arquivos (*)")
+        if not path: return
+        job = ImportJob(path, self.games, STATUS_OPTIONS, "Não jogado", parent=self)
+        job.batchReady.connect(self.apply_import_batch)
+        job.progress.connect(lambda lidas, novas, ignoradas: self.import_status.setText(
+            f"Importando: {lidas} linhas, {novas} jogos novos, {ignoradas} ignorados"))
+        job.finished.connect(self.import_finished)
+        self.import_job = job
+        self.import_btn.setText("Cancelar Importação")
+        job.start()
+
+    def apply_import_batch(self, games):
+        # Um lote = uma rodada de gravação (o PersistWorker junta as marcações) e um refresh
+        self.library.add_many(games)
+        self.refresh_views()
+
+    def import_finished(self, novas, ignoradas, erro):
+        self.import_job = None
+        self.import_btn.setText("Importar CSV/Excel/JSON")
+        if erro:
+            self.import_status.setText(f"Importação interrompida: {erro}")
+        self.show_toast(f"{novas} jogos importados, {ignoradas} ignorados.")
+
+    def import_steam(self):
+        # Só lê os manifestos locais (sem rede); varreduras seguintes só releem o que mudou
+        if self.steam_job is not None:
+            return
+        roots = steam_roots()
+        if not roots:
+            self.show_toast("Instalação da Steam não encontrada.")
+            return
+        job = SteamScanJob(roots, self.games, parent=self)
+        job.batchReady.connect(self.apply_import_batch)
+        job.finished.connect(self.steam_finished)
+        self.steam_job = job
+        self.steam_btn.setEnabled(False)
+        self.steam_btn.setText("Lendo a Steam...")
+        job.start()
+
+    def steam_finished(self, novos, instalados, erro):
+        self.steam_job = None
+        self.steam_btn.setEnabled(True)
+        self.steam_btn.setText("Importar Jogos Instalados da Steam")
+        if erro:
+            self.show_toast(f"Falha ao ler a Steam: {erro}")
+        else:
+            self.show_toast(f"{novos} jogos da Steam importados ({instalados} instalados).")
+
+    def refresh_summary(self):
+        st = self.stats
+        if not st.count:
+            self.resumo_info.setText("")
+            self.chart_lbl.setPixmap(QPixmap())
+            self.chart_lbl.setText("Nenhum jogo na biblioteca.")
+            self.chart_key = None
+            return
+        if CHECK_STATS:
+            self.check_stats()
+        self.resumo_info.setText(f"Jogos: {st.count}   •   Finalizados: {st.finished_count}   •   Total gasto: R$ {st.total_spend:.2f}")
+        # Gráficos renderizados fora da thread da GUI; mesma versão dos dados + tema = imagem do cache
+        key = (st.version, self.theme)
+        if key == self.chart_key:
+            return
+        png = self.charts.get(key, chart_data(st), THEMES[self.theme]["fg"])
+        if png is not None:
+            self.show_chart(key, png)
+        elif self.chart_key is None:
+            self.chart_lbl.setText("Gerando gráficos...")
+
+    def on_chart_rendered(self, key, png):
+        if key == (self.stats.version, self.theme):
+            self.show_chart(key, png)
+
+    def on_chart_failed(self, key, erro):
+        if key == (self.stats.version, self.theme):
+            self.chart_lbl.setPixmap(QPixmap())
+            self.chart_lbl.setText(f"Não foi possível gerar os gráficos: {erro}")
+
+    def show_chart(self, key, png):
+        pix = QPixmap()
+        pix.loadFromData(png)
+        if pix.width() > self.chart_lbl.width() > 1:
+            pix = pix.scaledToWidth(self.chart_lbl.width(), Qt.SmoothTransformation)
+        self.chart_lbl.setPixmap(pix)
+        self.chart_key = key
+
+    def export_charts(self):
+        if not self.stats.count:
             self.show_toast("Nenhum jogo na biblioteca.")
             return
-        df = pd.DataFrame(self.games)
-        plt.figure(figsize=(15, 10))
-        plt.subplot(2, 2, 1)
-        lojas = df['Plataforma/Loja'].value_counts()
-        plt.pie(lojas, labels=lojas.index, autopct='%1.0f%%')
-        plt.title("Jogos por Loja")
-        plt.subplot(2, 2, 2)
-        status = df['Status'].value_counts()
-        plt.pie(status, labels=status.index, autopct='%1.0f%%')
-        plt.title("Status dos Jogos")
-        plt.subplot(2, 2, 3)
-        generos = df['Gênero'].str.split(',').explode().value_counts().head(10)
-        generos.plot(kind='bar', color='skyblue')
-        plt.title("Jogos por Gênero (Top 10)")
-        plt.subplot(2, 2, 4)
-        df['Preço pago'] = pd.to_numeric(df['Preço pago'].str.replace(',', '.').str.replace('R$', '').str.strip(), errors='coerce')
-        gastos = df.groupby("Plataforma/Loja")["Preço pago"].sum()
-        gastos.plot(kind='bar', color='orange')
-        plt.title("Gastos por Plataforma")
-        plt.tight_layout()
-        plt.show()
-        total_gasto = df['Preço pago'].sum()
-        resumo = (
-            f"Quantidade total de jogos: {len(df)}\n"
-            f"Total gasto: R$ {total_gasto:.2f}\n"
-            f"Jogos por loja:\n{lojas.to_string()}\n"
-            f"Jogos por status:\n{status.to_string()}"
-        )
-        self.show_toast("Resumo exibido nos gráficos!")
+        path, filtro = QFileDialog.getSaveFileName(self, "Exportar Gráficos", "resumo.png", "PNG (*.png);;SVG (*.svg)")
+        if not path: return
+        fmt = "svg" if path.lower().endswith(".svg") or (filtro.startswith("SVG") and not path.lower().endswith(".png")) else "png"
+        if not path.lower().endswith("." + fmt):
+            path += "." + fmt
+        self.charts.export(path, fmt, chart_data(self.stats), THEMES[self.theme]["fg"])
+
+    def check_stats(self):
+        # Diagnóstico: se os agregados incrementais divergirem do recálculo, avisa e reconstrói
+        diff = self.stats.check(self.games)
+        if diff:
+            self.show_toast(f"Estatísticas inconsistentes ({', '.join(diff)}); recalculando.", 4000)
+            self.stats.rebuild(self.games)
+        return diff
 
     # ----------- Perfil (Aba) ---------
     def refresh_profile(self):
         # Avatar
-        if self.profile.get("avatar") and os.path.exists(self.profile["avatar"]):
-            pix = QPixmap(self.profile["avatar"])
-            self.avatar_p.setPixmap(pix.scaled(80, 80, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation))
-        else:
-            self.avatar_p.setPixmap(QPixmap())
+        # Avatar e wallpaper vêm de variantes já redimensionadas (cache/profile), refeitas só se o arquivo mudar
+        avatar = self.profile_images.get(self.profile.get("avatar"), (80, 80), fill=True)
+        self.avatar_p.setPixmap(avatar or QPixmap())
         # Nickname
         self.nick_label.setText(f'<span style="color:#a0f;">{self.profile.get("nickname", "Usuário")}</span>')
         # Bio
         self.bio_label.setText(self.profile.get("bio", ""))
-        # Wallpaper
-        if self.profile.get("wallpaper") and os.path.exists(self.profile["wallpaper"]):
-            pix = QPixmap(self.profile["wallpaper"])
-            self.wallpaper_lbl.setPixmap(pix.scaled(self.wallpaper_lbl.width(), self.wallpaper_lbl.height(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation))
-        else:
-            self.wallpaper_lbl.setPixmap(QPixmap())
+        self.refresh_wallpaper()
+        self.refresh_profile_stats()
+        # Posts/Prints
+        self.load_prints()
+
+    def refresh_wallpaper(self):
+        wallpaper = self.profile.get("wallpaper")
+        size = (self.wallpaper_lbl.width(), self.wallpaper_lbl.height())
+        def apply(pix, path=wallpaper):
+            if pix is not None and self.profile.get("wallpaper") == path:
+                self.wallpaper_lbl.setPixmap(pix)
+        pix = self.profile_images.get(wallpaper, size, fill=True, callback=apply)
+        if pix is not None or not wallpaper:
+            self.wallpaper_lbl.setPixmap(pix or QPixmap())
+
+    def refresh_profile_stats(self):
         # Conquistas
         conquistas = self.get_achievements()
         self.achievements_label.setText(f'Conquistas: 🏅 x{conquistas}')
         # Jogos zerados
-        zerados = [g['Nome'] for g in self.games if g.get("Status") == "Finalizado"]
+        zerados = list(self.stats.finished.values())
         self.finished_games_list.setText(', '.join(zerados) if zerados else "Nenhum jogo finalizado.")
-        # Posts/Prints
-        self.load_prints()
+        self.profile_view.mark_synced()
 
     def edit_profile(self):
         dlg = ProfileEditor(self, self.profile, self.update_profile)
@@ -838,6 +1092,7 @@ class GameLibrary(QWidget):
 
     def update_profile(self, profile):
         self.profile = profile
+        self.feed_dirty = True
         self.save_profile()
         self.refresh_profile()
         self.show_toast("Perfil atualizado!")
@@ -866,78 +1121,154 @@ class GameLibrary(QWidget):
             "img": "",
             "created": datetime.datetime.now().isoformat()
         }
-        if img_path:
-            fname = os.path.basename(img_path)
-            dst = os.path.join(PRINTS_DIR, f"{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}_{fname}")
-            shutil.copyfile(img_path, dst)
-            post["img"] = dst
+        if not img_path:
+            self.publish_post(post)
+            return
+        # Hash, cópia/recompressão e miniatura fora da thread da GUI; o post entra quando a miniatura existe
+        def stored(path, erro, post=post):
+            if path is None:
+                self.show_toast(f"Não foi possível salvar o print: {erro}")
+                return
+            post["img"] = path
+            self.publish_post(post)
+        self.prints.ingest(img_path, stored)
+        self.show_toast("Processando print...", 1100)
+
+    def publish_post(self, post):
         self.profile.setdefault("posts", []).insert(0, post)
         self.save_profile()
-        self.refresh_profile()
+        if not self.feed_dirty:
+            self.prints_feed.insertWidget(0, self.make_post_widget(post))
+            self.feed_shown += 1
         self.show_toast("Post adicionado!")
 
     def load_prints(self):
-        # Limpa prints antigos
-        while self.prints_feed.count():
+        # O feed só é remontado quando os posts mudam; trocar de aba não recria nada
+        if not self.feed_dirty:
+            return
+        self.feed_dirty = False
+        while self.prints_feed.count() > 1:
             child = self.prints_feed.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
-        for post in self.profile.get("posts", []):
-            post_box = QFrame()
-            post_box.setFrameShape(QFrame.StyledPanel)
-            box = QVBoxLayout(post_box)
-            # Se imagem, exibe
-            if post["img"] and os.path.exists(post["img"]):
-                lbl_img = QLabel()
-                lbl_img.setPixmap(QPixmap(post["img"]).scaled(440, 220, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                box.addWidget(lbl_img)
-            if post["text"]:
-                lbl_txt = QLabel(post["text"])
-                lbl_txt.setWordWrap(True)
-                lbl_txt.setStyleSheet("font-size:16px; color:#eee;")
-                box.addWidget(lbl_txt)
-            lbl_dt = QLabel(datetime.datetime.fromisoformat(post["created"]).strftime('%d/%m/%Y %H:%M'))
-            lbl_dt.setStyleSheet("color:#77aaff; font-size:13px;")
-            box.addWidget(lbl_dt)
-            self.prints_feed.addWidget(post_box)
+        self.feed_shown = 0
+        self.load_more_prints()
+
+    def load_more_prints(self):
+        posts = self.profile.get("posts", [])
+        page = posts[self.feed_shown:self.feed_shown + FEED_PAGE]
+        for post in page:
+            # antes do stretch final
+            self.prints_feed.insertWidget(self.prints_feed.count() - 1, self.make_post_widget(post))
+        self.feed_shown += len(page)
+
+    @traced("ui.post_widget")
+    def make_post_widget(self, post):
+        post_box = QFrame()
+        post_box.setFrameShape(QFrame.StyledPanel)
+        box = QVBoxLayout(post_box)
+        # Se imagem, exibe a miniatura (prints/thumbs), gerada em segundo plano na primeira vez
+        if post["img"] and os.path.exists(post["img"]):
+            lbl_img = QLabel("Carregando...")
+            lbl_img.setFixedHeight(FEED_THUMB_SIZE[1])
+            def apply(pix, lbl=lbl_img):
+                if pix is not None:
+                    lbl.setPixmap(pix)
+                else:
+                    lbl.setText("Imagem indisponível")
+            pix = self.feed_thumbs.get(post["img"], FEED_THUMB_SIZE, callback=apply)
+            if pix is not None:
+                lbl_img.setPixmap(pix)
+            box.addWidget(lbl_img)
+        if post["text"]:
+            lbl_txt = QLabel(post["text"])
+            lbl_txt.setWordWrap(True)
+            lbl_txt.setStyleSheet("font-size:16px; color:#eee;")
+            box.addWidget(lbl_txt)
+        lbl_dt = QLabel(datetime.datetime.fromisoformat(post["created"]).strftime('%d/%m/%Y %H:%M'))
+        lbl_dt.setStyleSheet("color:#77aaff; font-size:13px;")
+        box.addWidget(lbl_dt)
+        return post_box
 
     def get_achievements(self):
         # Exemplo: 1 conquista por jogo finalizado
-        return len([g for g in self.games if g.get("Status") == "Finalizado"])
+        return self.stats.finished_count
 
     # ----------- Arquivos -----------
+    # Gravações vão para o PersistWorker, que junta rajadas e escreve fora da thread da GUI
     def save_library(self):
-        with open(BIB_PATH, "w", encoding="utf-8") as f:
-            json.dump(self.games, f, ensure_ascii=False, indent=2)
-        self.backup_library()
+        self.writer.mark_all()
+
+    def save_game(self, game):
+        # Escrita O(1): uma linha no SQLite ou um registro no journal do JSON.
+        # O backup acontece quando o journal é compactado num snapshot novo.
+        self.writer.mark_dirty(game)
+
+    def favorites(self):
+        # A lista em memória é a fonte da verdade: a GUI nunca espera o PersistWorker gravar
+        return [g for g in self.games if g.get("Favorito")]
 
     def backup_library(self):
-        if not os.path.exists(BACKUP_DIR):
-            os.makedirs(BACKUP_DIR)
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = os.path.join(BACKUP_DIR, f"biblioteca_{timestamp}.json")
-        shutil.copyfile(BIB_PATH, backup_path)
+        # Deduplicado e em segundo plano: só os blocos de jogos alterados vão para o disco
+        self.backups.create_async([dict(g) for g in self.games])
+
+    def restore_backup(self):
+        backups = self.backups.list()
+        if not backups:
+            self.show_toast("Nenhum backup encontrado.")
+            return
+        labels = [b.label() for b in backups]
+        escolha, ok = QInputDialog.getItem(self, "Restaurar Backup", "Backup:", labels, 0, False)
+        if not ok:
+            return
+        backup = backups[labels.index(escolha)]
+        reply = QMessageBox.question(self, 'Restaurar Backup',
+            f"Substituir a biblioteca atual pelo backup de {escolha}?", QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        self.backup_library()
+        games = self.backups.restore(backup.id)
+        ensure_ids(games)
+        # Backups antigos ainda trazem capas em hex: migram para blobs como no load_library
+        migrate_inline_covers(games, self.blobs)
+        self.library.reset(games)
+        self.save_library()
+        self.refresh_views()
+        self.show_toast("Backup restaurado!")
 
+    @traced("library.load")
     def load_library(self):
-        if os.path.exists(BIB_PATH):
-            with open(BIB_PATH, "r", encoding="utf-8") as f:
-                self.games = json.load(f)
-            self.refresh_library()
-            self.refresh_favs()
+        games = self.storage.load()
+        if not games:
+            return
+        dirty = ensure_ids(games)
+        if any(g.get("Imagem_manual") and g.get("Imagem") and not is_blob_ref(g["Imagem"]) for g in games):
+            # Migração única: capas em hex saem do JSON (cópia do arquivo original fica ao lado)
+            if os.path.exists(BIB_PATH) and not os.path.exists(BIB_PATH + ".pre-blobs.bak"):
+                shutil.copyfile(BIB_PATH, BIB_PATH + ".pre-blobs.bak")
+            dirty += migrate_inline_covers(games, self.blobs)
+        self.library.reset(games)
+        if dirty:
+            self.save_library()
+        self.refresh_views()
 
     def save_profile(self):
-        with open(PROFILE_PATH, "w", encoding="utf-8") as f:
-            json.dump(self.profile, f, ensure_ascii=False, indent=2)
+        self.writer.mark_profile(self.profile)
 
     def load_profile(self):
         if os.path.exists(PROFILE_PATH):
             with open(PROFILE_PATH, "r", encoding="utf-8") as f:
                 self.profile = json.load(f)
+            # O setup_ui já montou o feed com o perfil padrão (sem posts)
+            self.feed_dirty = True
             self.refresh_profile()
 
     def set_theme(self, theme_name):
         self.theme = theme_name
-        self.setStyleSheet(self.generate_stylesheet())
+        with span("ui.stylesheet"):
+            self.setStyleSheet(self.generate_stylesheet())
+        if self.page_resumo.isVisible():
+            self.refresh_summary()
         self.show_toast(f"Tema: {theme_name}!")
 
     def generate_stylesheet(self):
@@ -951,18 +1282,56 @@ class GameLibrary(QWidget):
             QTextEdit {{ background:{t['input']}; color:{t['fg']}; border-radius:9px; font-size:16px;}}
         """
 
+    def closeEvent(self, event):
+        self.prints.close()
+        # Entrega os prints que terminaram agora (publish_post -> mark_profile) antes de fechar o writer
+        QApplication.processEvents()
+        self.cover_loader.close()
+        self.charts.close()
+        if self.export_job is not None:
+            self.export_job.cancel()
+        if self.import_job is not None:
+            self.import_job.cancel()
+            self.import_job.thread.join()
+        if self.steam_job is not None:
+            self.steam_job.thread.join()
+        if self.enrich_job is not None:
+            # O estado já salvo por lote permite retomar na próxima abertura
+            self.enrich_job.cancel()
+        self.writer.close()
+        self.storage.close()
+        # Backup de fim de sessão (sai de graça se nada mudou desde o último)
+        self.backups.create([dict(g) for g in self.games])
+        if TRACER.enabled and TRACER.events:
+            TRACER.export(TRACE_PATH)
+            print(f"Trace salvo em {TRACE_PATH}")
+        super().closeEvent(event)
+
     def show_toast(self, msg, duration=1750):
         toast = Toast(msg, self, duration)
         toast.show()
 
 if __name__ == '__main__':
+    # python main.py --startup-time: mede até a primeira pintura da janela, imprime e fecha
+    timing = "--startup-time" in sys.argv
+    imported = time.perf_counter()
     app = QApplication(sys.argv)
     splash = SplashScreen()
     splash.show()
     def start_main():
         window = GameLibrary()
+        built = time.perf_counter()
+        def ready():
+            # A splash sai quando a janela de fato está na tela, não depois de um tempo fixo
+            splash.close()
+            if timing:
+                ms = lambda t: (t - STARTUP_T0) * 1000
+                print(f"imports: {ms(imported):.0f} ms | janela construída: {ms(built):.0f} ms | "
+                      f"primeira pintura: {ms(time.perf_counter()):.0f} ms")
+                window.close()
+        FirstPaint(window, ready)
         window.show()
-        splash.close()
         app.window = window
-    QTimer.singleShot(1400, start_main)
+    # Deixa a splash pintar antes de construir a janela
+    QTimer.singleShot(0, start_main)
     sys.exit(app.exec_())
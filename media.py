@@ -0,0 +1,153 @@
+import os, hashlib
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImageReader, QPixmap
+from PyQt5.QtCore import Qt, QSize, QObject, QBuffer, QByteArray, QIODevice
+
+from dispatch import Dispatcher
+from storage import write_bytes_atomic
+from tracing import traced
+
+PROFILE_CACHE_DIR = os.path.join("cache", "profile")    # wallpaper/avatar já redimensionados
+THUMBS_DIR = os.path.join("prints", "thumbs")           # miniaturas do feed de prints
+FEED_THUMB_SIZE = (440, 220)
+FEED_PAGE = 20              # posts montados por vez no feed
+VARIANT_MEM_ITEMS = 128
+
+
+def source_prefix(path):
+    return hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+
+
+def variant_key(path, size, fill):
+    # Muda quando a imagem de origem muda (mtime/tamanho) ou quando muda o tamanho alvo
+    st = os.stat(path)
+    return f"{source_prefix(path)}_{st.st_mtime_ns}_{st.st_size}_{size[0]}x{size[1]}{'f' if fill else ''}"
+
+
+@traced("media.scale")
+def scale_image(path, size, fill=False):
+    # Decodifica já reduzido quando o formato permite (JPEG), em vez de abrir o 4K inteiro e escalar depois
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    src = reader.size()
+    target = QSize(*size)
+    if src.isValid():
+        scaled = src.scaled(target, Qt.KeepAspectRatioByExpanding if fill else Qt.KeepAspectRatio)
+        if scaled.width() < src.width():
+            reader.setScaledSize(scaled)
+    image = reader.read()
+    if image.isNull():
+        return None
+    mode = Qt.KeepAspectRatioByExpanding if fill else Qt.KeepAspectRatio
+    if image.width() > target.width() or image.height() > target.height() or fill:
+        image = image.scaled(target, mode, Qt.SmoothTransformation)
+    if fill:
+        x = max(0, (image.width() - target.width()) // 2)
+        y = max(0, (image.height() - target.height()) // 2)
+        image = image.copy(x, y, min(image.width(), target.width()), min(image.height(), target.height()))
+    return image
+
+
+def image_bytes(image, fmt, quality=-1):
+    # QImage codificado em memória; b"" se o Qt não tiver plugin para o formato (ex.: webp)
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    ok = image.save(buf, fmt, quality)
+    buf.close()
+    return bytes(data) if ok else b""
+
+
+class ImageVariants(QObject):
+    """Versões redimensionadas de imagens locais, guardadas em disco e em memória.
+
+    A chave junta o caminho, mtime e tamanho do arquivo de origem e o tamanho
+    alvo; variantes de uma versão antiga da mesma origem são apagadas quando a
+    nova é gerada. get(..., callback) gera em segundo plano e chama
+    callback(pix) quando pronto; sem callback, gera na hora.
+    """
+
+    def __init__(self, cache_dir, mem_items=VARIANT_MEM_ITEMS, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.mem_items = mem_items
+        self.mem = OrderedDict()    # chave -> QPixmap
+        self.dispatch = Dispatcher(self._on_done, 2, "gameslog-media", self)
+
+    def _files(self, key):
+        return [os.path.join(self.cache_dir, key + ext) for ext in (".jpg", ".png")]
+
+    def _mem_put(self, key, pix):
+        self.mem[key] = pix
+        self.mem.move_to_end(key)
+        while len(self.mem) > self.mem_items:
+            self.mem.popitem(last=False)
+
+    def cached(self, path, size, fill=False):
+        if not path or not os.path.exists(path):
+            return None, None
+        key = variant_key(path, size, fill)
+        pix = self.mem.get(key)
+        if pix is not None:
+            self.mem.move_to_end(key)
+            return key, pix
+        for name in self._files(key):
+            if os.path.exists(name):
+                pix = QPixmap(name)
+                if not pix.isNull():
+                    self._mem_put(key, pix)
+                    return key, pix
+        return key, None
+
+    def get(self, path, size, fill=False, callback=None):
+        key, pix = self.cached(path, size, fill)
+        if key is None or pix is not None:
+            return pix
+        if callback is None:
+            image = self._generate(key, path, size, fill)
+            if image is None:
+                return None
+            pix = QPixmap.fromImage(image)
+            self._mem_put(key, pix)
+            return pix
+        if not self.dispatch.wait(key, callback):
+            self.dispatch.submit(key, self._generate, key, path, size, fill)
+        return None
+
+    def _generate(self, key, path, size, fill):
+        # Seguro fora da thread da GUI: só QImage e sistema de arquivos
+        image = scale_image(path, size, fill)
+        if image is None:
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        jpg, png = self._files(key)
+        # JPEG para fotos/prints; PNG só quando há transparência (ex.: avatar recortado)
+        name, fmt = (png, "PNG") if image.hasAlphaChannel() else (jpg, "JPG")
+        data = image_bytes(image, fmt, 88)
+        if data:
+            write_bytes_atomic(name, data)
+        self._prune(key)
+        return image
+
+    def _prune(self, key):
+        # Remove variantes de versões anteriores do mesmo arquivo (outro mtime/tamanho)
+        prefix, stamp = key.split("_", 1)[0], "_".join(key.split("_")[1:3])
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return
+        for entry in entries:
+            parts = entry.name.split("_")
+            if len(parts) >= 4 and parts[0] == prefix and "_".join(parts[1:3]) != stamp:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def _on_done(self, key, image):
+        if image is None:
+            return None
+        pix = QPixmap.fromImage(image)
+        self._mem_put(key, pix)
+        return pix
@@ -0,0 +1,164 @@
+import copy, queue, threading
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from storage import write_atomic
+from tracing import traced
+
+PERSIST_WINDOW_MS = 400     # rajadas de mutações dentro desta janela viram uma gravação só
+PERSIST_RETRY_MS = 5000     # nova tentativa depois de uma gravação que falhou
+
+
+class _Batch:
+    def __init__(self):
+        self.games = []         # cópias dos jogos alterados/adicionados
+        self.deleted = []       # ids removidos
+        self.snapshot = None    # cópia da biblioteca inteira (gravação completa ou compactação)
+        self.full = False
+        self.profile = None
+        self.backup = False
+
+
+class PersistWorker(QObject):
+    """Grava biblioteca e perfil numa thread própria, juntando rajadas de mudanças.
+
+    A GUI só marca o que ficou sujo (mark_*); depois de PERSIST_WINDOW_MS
+    sem novas marcações, flush() copia o estado sujo e entrega o lote à
+    thread de escrita. pendingChanged avisa quando há gravação pendente;
+    failed(erro) avisa quando um lote não foi gravado (ele volta a ficar
+    pendente, como gravação completa, e é tentado de novo).
+    """
+    pendingChanged = pyqtSignal(bool)
+    failed = pyqtSignal(str)
+    _written = pyqtSignal(object, str)
+
+    def __init__(self, storage, backups, profile_path, get_games, window_ms=PERSIST_WINDOW_MS, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self.backups = backups
+        self.profile_path = profile_path
+        self.get_games = get_games
+        self.dirty = {}         # id -> jogo vivo
+        self.deleted = set()
+        self.full = False
+        self.profile = None
+        self.in_flight = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(window_ms)
+        self.timer.timeout.connect(self.flush)
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.setInterval(PERSIST_RETRY_MS)
+        self.retry_timer.timeout.connect(self.flush)
+        self._written.connect(self._on_written)
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="gameslog-persist", daemon=True)
+        self.thread.start()
+
+    # ----------- Marcação (thread da GUI) -----------
+    def mark_dirty(self, game):
+        self.storage.track(game)
+        self.deleted.discard(game["id"])
+        self.dirty[game["id"]] = game
+        self._schedule()
+
+    def mark_deleted(self, game):
+        self.storage.untrack(game["id"])
+        self.dirty.pop(game["id"], None)
+        self.deleted.add(game["id"])
+        self._schedule()
+
+    def mark_all(self):
+        self.storage.track_all(self.get_games())
+        self.full = True
+        self._schedule()
+
+    def mark_profile(self, profile):
+        self.profile = profile
+        self._schedule()
+
+    def _schedule(self):
+        was_pending = self.pending()
+        self.timer.start()
+        if not was_pending:
+            self.pendingChanged.emit(True)
+
+    def pending(self):
+        return bool(self.timer.isActive() or self.in_flight or self.dirty or self.deleted or self.full or self.profile is not None)
+
+    # ----------- Envio para a thread de escrita -----------
+    def flush(self):
+        self.timer.stop()
+        self.retry_timer.stop()
+        if not (self.dirty or self.deleted or self.full or self.profile is not None):
+            return
+        batch = _Batch()
+        if self.full or self.storage.wants_compaction():
+            batch.snapshot = [dict(g) for g in self.get_games()]
+            batch.full = self.full
+            batch.backup = True
+        else:
+            batch.games = [dict(g) for g in self.dirty.values()]
+            batch.deleted = list(self.deleted)
+        if self.profile is not None:
+            batch.profile = copy.deepcopy(self.profile)
+        self.dirty, self.deleted, self.full, self.profile = {}, set(), False, None
+        self.in_flight += 1
+        self.queue.put(batch)
+
+    def sync(self):
+        # Grava tudo agora e espera terminar (consultas no SQLite, fechamento do app)
+        self.flush()
+        self.queue.join()
+
+    def close(self):
+        self.sync()
+        self.queue.put(None)
+        self.thread.join()
+
+    # ----------- Thread de escrita -----------
+    def _run(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                self.queue.task_done()
+                return
+            error = ""
+            try:
+                self._write(batch)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            finally:
+                self.queue.task_done()
+                self._written.emit(batch, error)
+
+    @traced("persist.write")
+    def _write(self, batch):
+        if batch.snapshot is not None:
+            if batch.full:
+                self.storage.save_all(batch.snapshot)
+            else:
+                self.storage.compact(batch.snapshot)
+        else:
+            if batch.games:
+                self.storage.save_games(batch.games)
+            if batch.deleted:
+                self.storage.delete_games(batch.deleted)
+        if batch.profile is not None:
+            write_atomic(self.profile_path, batch.profile)
+        if batch.backup:
+            self.backups.create(batch.snapshot)
+
+    def _on_written(self, batch, error):
+        self.in_flight -= 1
+        if error:
+            # Nada do lote é dado como gravado: a próxima tentativa grava a biblioteca inteira
+            self.full = True
+            if batch.profile is not None and self.profile is None:
+                self.profile = batch.profile
+            self.failed.emit(error)
+            self.retry_timer.start()
+            return
+        if not self.pending():
+            self.pendingChanged.emit(False)
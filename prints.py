@@ -0,0 +1,90 @@
+import os, hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtGui import QImageReader
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from media import FEED_THUMB_SIZE, image_bytes, variant_key
+from storage import write_bytes_atomic
+
+PRINTS_DIR = "prints"
+# Recompressão opcional dos prints: "original" (padrão, guarda o arquivo como veio), "jpg" ou "webp"
+PRINT_FORMAT = os.environ.get("GAMESLOG_PRINT_FORMAT", "original").lower()
+PRINT_QUALITY = int(os.environ.get("GAMESLOG_PRINT_QUALITY", "90"))
+PRINT_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp")
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class PrintIngestor(QObject):
+    """Guarda prints em prints/ endereçados pelo sha256 do arquivo original.
+
+    O mesmo print postado duas vezes vira um arquivo só. Fora da thread da
+    GUI: calcula o hash, copia (ou recomprime em PRINT_FORMAT/PRINT_QUALITY)
+    e já gera a miniatura do feed; callback(caminho|None, erro) é chamado na
+    GUI quando tudo está pronto.
+    """
+    _done = pyqtSignal(object, object, str)
+
+    def __init__(self, thumbs, prints_dir=PRINTS_DIR, fmt=PRINT_FORMAT, quality=PRINT_QUALITY, parent=None):
+        super().__init__(parent)
+        self.thumbs = thumbs
+        self.prints_dir = prints_dir
+        self.fmt = fmt
+        self.quality = quality
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gameslog-prints")
+        self._done.connect(lambda callback, path, error: callback(path, error))
+
+    def find(self, digest):
+        for ext in PRINT_EXTS:
+            path = os.path.join(self.prints_dir, digest[:32] + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def ingest(self, src, callback):
+        self.pool.submit(self._run, src, callback)
+
+    def _run(self, src, callback):
+        error = ""
+        try:
+            path = self._store(src)
+            # Miniatura pronta antes do post aparecer (só disco: QPixmap não pode ser usado aqui)
+            key = variant_key(path, FEED_THUMB_SIZE, False)
+            if not any(os.path.exists(name) for name in self.thumbs._files(key)):
+                self.thumbs._generate(key, path, FEED_THUMB_SIZE, False)
+        except Exception as e:
+            path, error = None, str(e)
+        self._done.emit(callback, path, error)
+
+    def _store(self, src):
+        digest = file_digest(src)
+        existing = self.find(digest)
+        if existing:
+            return existing
+        os.makedirs(self.prints_dir, exist_ok=True)
+        name = digest[:32]
+        if self.fmt in ("jpg", "webp"):
+            reader = QImageReader(src)
+            reader.setAutoTransform(True)
+            image = reader.read()
+            data = b"" if image.isNull() else image_bytes(image, self.fmt.upper(), self.quality)
+            # formato sem plugin no Qt (ex.: webp): guarda o original
+            if data:
+                dst = os.path.join(self.prints_dir, f"{name}.{self.fmt}")
+                write_bytes_atomic(dst, data)
+                return dst
+        ext = os.path.splitext(src)[1].lower()
+        dst = os.path.join(self.prints_dir, name + (ext if ext in PRINT_EXTS else ".png"))
+        with open(src, "rb") as f:
+            write_bytes_atomic(dst, f.read())
+        return dst
+
+    def close(self):
+        self.pool.shutdown(wait=True)
@@ -0,0 +1,128 @@
+import os, json, time, sqlite3, threading
+
+from tracing import span
+
+RAWG_TIMEOUT = (3.05, 10)               # (conexão, leitura) em segundos
+RAWG_RATE = 4.0                         # requisições por segundo
+RAWG_BURST = 8
+RAWG_CACHE_PATH = os.path.join("cache", "rawg.db")
+RAWG_SEARCH_TTL = 7 * 86400
+RAWG_DETAIL_TTL = 30 * 86400
+RAWG_MISS_TTL = 86400                   # "não encontrado" também fica em cache, por menos tempo
+
+
+class TokenBucket:
+    def __init__(self, rate=RAWG_RATE, capacity=RAWG_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """Cache persistente (SQLite) de respostas da RAWG com prazo de validade."""
+
+    def __init__(self, path=RAWG_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires REAL NOT NULL, body TEXT NOT NULL)")
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute("SELECT expires, body FROM responses WHERE key=?", (key,)).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        return json.loads(row[1])
+
+    def put(self, key, body, ttl):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO responses VALUES (?,?,?)",
+                            (key, time.time() + ttl, json.dumps(body, ensure_ascii=False)))
+
+
+class RawgClient:
+    """Cliente da RAWG: Session com keep-alive, timeouts, retries com backoff,
+    limite de taxa (token bucket) e cache persistente de busca e detalhes.
+    Seguro para usar a partir de várias threads."""
+
+    def __init__(self, key, base_url, cache=None, bucket=None, timeout=RAWG_TIMEOUT):
+        self.key = key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache = cache if cache is not None else ResponseCache()
+        self.bucket = bucket or TokenBucket()
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        # Criada no primeiro uso: requests/urllib3 não pesam na abertura do app
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                session = requests.Session()
+                retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                              allowed_methods=("GET",), respect_retry_after_header=True)
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=retry)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def _get(self, path, params, ttl):
+        cache_key = path + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached.get("data")
+        self.bucket.acquire()
+        with span("net.get", url=self.base_url + path):
+            r = self.session.get(self.base_url + path, params={**params, "key": self.key}, timeout=self.timeout)
+        if r.status_code == 404:
+            self.cache.put(cache_key, {"data": None}, RAWG_MISS_TTL)
+            return None
+        r.raise_for_status()
+        data = r.json()
+        self.cache.put(cache_key, {"data": data}, ttl)
+        return data
+
+    def search(self, nome):
+        data = self._get("", {"search": nome.strip().lower(), "page_size": 1}, RAWG_SEARCH_TTL)
+        results = (data or {}).get("results") or []
+        return results[0] if results else None
+
+    def details(self, game_id):
+        return self._get(f"/{game_id}", {}, RAWG_DETAIL_TTL)
+
+    def game_data(self, nome):
+        # Busca + detalhes, já no formato usado por GameLibrary.add_game
+        game = self.search(nome)
+        if not game:
+            return {}
+        details = self.details(game["id"]) or {}
+        devs = details.get("developers") or game.get("developers") or []
+        return {
+            'nome': game['name'],
+            'imagem': game.get('background_image') or '',
+            'genero': ', '.join(g['name'] for g in game.get('genres', [])),
+            'descricao': details.get('description_raw') or '',
+            'data_lancamento': game.get('released') or '',
+            'dev': ', '.join(d['name'] for d in devs),
+            'link': f"https://rawg.io/games/{game['slug']}",
+        }
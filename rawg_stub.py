@@ -0,0 +1,99 @@
+import os, sys, json, re, threading, argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "rawg")
+
+# Servidor local que imita a API da RAWG reproduzindo respostas gravadas em fixtures/rawg:
+#   search/<termo>.json  -> GET /api/games?search=<termo>
+#   games/<id>.json      -> GET /api/games/<id>
+# Uso: python rawg_stub.py --port 8765
+#      RAWG_API_URL=http://127.0.0.1:8765/api/games RAWG_KEY=stub python main.py
+# Gravar respostas reais: python rawg_stub.py --record "Hades" "Celeste" --key SUA_CHAVE
+
+
+def slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.strip().lower()).strip("-")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fixtures = FIXTURES_DIR
+    requests_seen = None
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if self.requests_seen is not None:
+            self.requests_seen.append(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        if parts[-1:] == ["games"]:
+            path = os.path.join(self.fixtures, "search", slug(query.get("search", [""])[0]) + ".json")
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return self._send(200, json.load(f))
+            return self._send(200, {"count": 0, "next": None, "previous": None, "results": []})
+        if len(parts) >= 2 and parts[-2] == "games":
+            path = os.path.join(self.fixtures, "games", parts[-1] + ".json")
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return self._send(200, json.load(f))
+        return self._send(404, {"detail": "Not found."})
+
+
+class RawgStub:
+    """Sobe o servidor numa thread; use como context manager e aponte o cliente para .base_url."""
+
+    def __init__(self, fixtures=FIXTURES_DIR, port=0):
+        handler = type("Handler", (_Handler,), {"fixtures": fixtures, "requests_seen": []})
+        self.requests_seen = handler.requests_seen
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/api/games"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def record(names, key, base_url="https://api.rawg.io/api/games", fixtures=FIXTURES_DIR):
+    import requests
+    for nome in names:
+        r = requests.get(base_url, params={"key": key, "search": nome.strip().lower(), "page_size": 1}, timeout=10)
+        r.raise_for_status()
+        data = r.json()
+        with open(os.path.join(fixtures, "search", slug(nome) + ".json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        for game in data.get("results", []):
+            d = requests.get(f"{base_url}/{game['id']}", params={"key": key}, timeout=10)
+            d.raise_for_status()
+            with open(os.path.join(fixtures, "games", f"{game['id']}.json"), "w", encoding="utf-8") as f:
+                json.dump(d.json(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API da RAWG")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--record", nargs="+", metavar="NOME", help="grava respostas reais para os jogos informados")
+    parser.add_argument("--key", default=os.environ.get("RAWG_KEY", ""))
+    args = parser.parse_args()
+    if args.record:
+        record(args.record, args.key)
+        sys.exit(0)
+    stub = RawgStub(port=args.port)
+    print(f"RAWG stub em {stub.base_url}")
+    stub.server.serve_forever()
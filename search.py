@@ -0,0 +1,176 @@
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+# Campos indexados e peso de cada um no ranking
+SEARCH_FIELDS = [
+    ("Nome", 10),
+    ("Plataforma/Loja", 4),
+    ("Gênero", 4),
+    ("Status", 3),
+    ("Anotações", 2),
+    ("Descrição", 1),
+]
+# Campos curtos ganham índice de trigramas (busca por substring); textos longos, índice de palavras (prefixo)
+TRIGRAM_FIELDS = 5
+
+
+def fold(text):
+    # minúsculas e sem acentos: "Não Jogado" -> "nao jogado"
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Índice de busca incremental da biblioteca.
+
+    Mantém, por jogo, os campos já normalizados, um índice de trigramas dos
+    campos curtos e um índice de palavras de todos os campos. Buscas que só
+    estendem a anterior filtram o resultado anterior em vez de varrer tudo.
+    """
+
+    def __init__(self):
+        self.docs = {}                  # doc -> jogo
+        self.fields = {}                # doc -> tupla de campos normalizados
+        self.seq = {}                   # doc -> posição de inserção (ordem da biblioteca)
+        self.grams = defaultdict(set)   # trigrama -> docs
+        self.words = defaultdict(set)   # palavra -> docs
+        self._vocab = None              # palavras ordenadas, para busca por prefixo
+        self._next_seq = 0
+        self._last = None               # (consulta, resultado) para estreitamento incremental
+        self._pending = None            # lista de jogos ainda não indexada (construção preguiçosa)
+
+    def doc_id(self, game):
+        # id persistente do jogo (storage.ensure_ids), não a identidade do dict
+        return game["id"]
+
+    # ----------- Manutenção -----------
+    def rebuild(self, games):
+        # Só indexa de fato na primeira busca; até lá, add/remove são absorvidos pela lista viva
+        self.__init__()
+        self._pending = games
+
+    def _build(self):
+        games, self._pending = self._pending, None
+        for game in games:
+            self.add(game)
+
+    def add(self, game):
+        if self._pending is not None:
+            return
+        doc = self.doc_id(game)
+        if doc in self.docs:
+            self._unindex(doc)
+        else:
+            self.seq[doc] = self._next_seq
+            self._next_seq += 1
+        self.docs[doc] = game
+        fields = tuple(fold(game.get(name, "")) for name, _ in SEARCH_FIELDS)
+        self.fields[doc] = fields
+        for text in fields[:TRIGRAM_FIELDS]:
+            for g in trigrams(text):
+                self.grams[g].add(doc)
+        for text in fields:
+            for w in text.split():
+                if w not in self.words:
+                    self._vocab = None
+                self.words[w].add(doc)
+        self._last = None
+
+    def update(self, game):
+        self.add(game)
+
+    def remove(self, game):
+        if self._pending is not None:
+            return
+        doc = self.doc_id(game)
+        if doc not in self.docs:
+            return
+        self._unindex(doc)
+        del self.docs[doc], self.seq[doc]
+        self._last = None
+
+    def _unindex(self, doc):
+        fields = self.fields.pop(doc)
+        for text in fields[:TRIGRAM_FIELDS]:
+            for g in trigrams(text):
+                docs = self.grams.get(g)
+                if docs is not None:
+                    docs.discard(doc)
+                    if not docs:
+                        del self.grams[g]
+        for text in fields:
+            for w in text.split():
+                docs = self.words.get(w)
+                if docs is not None:
+                    docs.discard(doc)
+                    if not docs:
+                        del self.words[w]
+                        self._vocab = None
+
+    # ----------- Consulta -----------
+    def _prefix_docs(self, term):
+        if self._vocab is None:
+            self._vocab = sorted(self.words)
+        found = set()
+        i = bisect_left(self._vocab, term)
+        while i < len(self._vocab) and self._vocab[i].startswith(term):
+            found |= self.words[self._vocab[i]]
+            i += 1
+        return found
+
+    def _candidates(self, term):
+        if len(term) < 3:
+            return None
+        postings = sorted((self.grams.get(g, ()) for g in trigrams(term)), key=len)
+        docs = set(postings[0]).intersection(*postings[1:]) if postings else set()
+        return docs | self._prefix_docs(term)
+
+    def _score(self, fields, terms):
+        total = 0
+        for term in terms:
+            score = 0
+            for i, (text, (_, weight)) in enumerate(zip(fields, SEARCH_FIELDS)):
+                if i < TRIGRAM_FIELDS:
+                    pos = text.find(term)
+                    if pos < 0:
+                        continue
+                    # início do campo ou de palavra pesa mais
+                    score += weight * (3 if pos == 0 else 2 if text[pos - 1] == " " else 1)
+                elif (" " + term) in (" " + text):
+                    score += weight
+            if not score:
+                return 0
+            total += score
+        return total
+
+    def search(self, query):
+        if self._pending is not None:
+            self._build()
+        q = " ".join(fold(query).split())
+        terms = q.split()
+        if not terms:
+            return [self.docs[d] for d in sorted(self.docs, key=self.seq.get)]
+        cands = None
+        if self._last is not None and q.startswith(self._last[0]):
+            # consulta estendida: o resultado novo é subconjunto do anterior
+            cands = set(self._last[1])
+        for term in terms:
+            docs = self._candidates(term)
+            if docs is not None:
+                cands = docs if cands is None else cands & docs
+        if cands is None:
+            cands = self.docs.keys()
+        ranked = []
+        for doc in cands:
+            score = self._score(self.fields[doc], terms)
+            if score:
+                ranked.append((-score, self.seq[doc], doc))
+        ranked.sort()
+        result = [doc for _, _, doc in ranked]
+        self._last = (q, result)
+        return [self.docs[d] for d in result]
@@ -0,0 +1,133 @@
+import re
+from collections import Counter, defaultdict
+
+FINISHED_STATUS = "Finalizado"
+_PRICE_CHARS = re.compile(r"[^0-9,.\-]")
+
+
+def parse_price(text):
+    # "R$ 59,90", "1.234,56", "1,234.56", "59.90", "R$ 1.000" -> float; vazio ou inválido -> 0.0
+    s = _PRICE_CHARS.sub("", str(text or ""))
+    if not s:
+        return 0.0
+    last = max(s.rfind(","), s.rfind("."))
+    if last >= 0:
+        sep = s[last]
+        other = "." if sep == "," else ","
+        if s.count(sep) > 1 or (sep == "." and other not in s and len(s) - last - 1 == 3):
+            # "1.000.000", "1,000,000", "1.000": só separadores de milhar
+            s = s.replace(sep, "").replace(other, "")
+        else:
+            # o último separador é o decimal; os de antes são milhares
+            s = s[:last].replace(",", "").replace(".", "") + "." + s[last + 1:]
+    try:
+        return float(s)
+    except ValueError:
+        return 0.0
+
+
+def split_genres(text):
+    return tuple(g.strip() for g in str(text or "").split(",") if g.strip())
+
+
+class LibraryStats:
+    """Agregados da biblioteca mantidos a cada mutação.
+
+    Guarda, por jogo (id), a contribuição que ele deu aos contadores; ao
+    editar ou remover, a contribuição antiga é desfeita e a nova aplicada,
+    então nada precisa varrer a biblioteca. version muda a cada alteração
+    (chave de cache para quem desenha a partir destes números).
+    """
+
+    def __init__(self):
+        self.by_store = Counter()
+        self.by_status = Counter()
+        self.by_genre = Counter()
+        self.spend_by_store = defaultdict(float)
+        self.total_spend = 0.0
+        self.finished = {}          # id -> nome, jogos com status Finalizado
+        self.contrib = {}           # id -> (loja, status, gêneros, preço, nome)
+        self.version = 0
+
+    @staticmethod
+    def _contribution(game):
+        return (game.get("Plataforma/Loja", ""), game.get("Status", ""), split_genres(game.get("Gênero")),
+                parse_price(game.get("Preço pago")), game.get("Nome", ""))
+
+    def _apply(self, game_id, contrib, sign):
+        store, status, genres, price, nome = contrib
+        self.by_store[store] += sign
+        self.by_status[status] += sign
+        for genre in genres:
+            self.by_genre[genre] += sign
+        self.spend_by_store[store] += sign * price
+        self.total_spend += sign * price
+        if sign < 0:
+            for counter in (self.by_store, self.by_status, self.by_genre):
+                for key in [k for k in (store, status) + genres if counter.get(k) == 0]:
+                    del counter[key]
+            if not self.by_store.get(store):
+                self.spend_by_store.pop(store, None)
+            self.finished.pop(game_id, None)
+        elif status == FINISHED_STATUS:
+            self.finished[game_id] = nome
+
+    # ----------- Manutenção -----------
+    def rebuild(self, games):
+        version = self.version
+        self.__init__()
+        for game in games:
+            self.add(game)
+        self.version = version + 1
+
+    def add(self, game):
+        if game["id"] in self.contrib:
+            return self.update(game)
+        contrib = self._contribution(game)
+        self.contrib[game["id"]] = contrib
+        self._apply(game["id"], contrib, +1)
+        self.version += 1
+
+    def update(self, game):
+        old = self.contrib.get(game["id"])
+        new = self._contribution(game)
+        if old == new:
+            return
+        if old is not None:
+            self._apply(game["id"], old, -1)
+        self.contrib[game["id"]] = new
+        self._apply(game["id"], new, +1)
+        self.version += 1
+
+    def remove(self, game):
+        old = self.contrib.pop(game["id"], None)
+        if old is not None:
+            self._apply(game["id"], old, -1)
+            self.version += 1
+
+    # ----------- Leitura -----------
+    @property
+    def count(self):
+        return len(self.contrib)
+
+    @property
+    def finished_count(self):
+        return len(self.finished)
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "by_store": dict(self.by_store),
+            "by_status": dict(self.by_status),
+            "by_genre": dict(self.by_genre),
+            "spend_by_store": {k: round(v, 2) for k, v in self.spend_by_store.items()},
+            "total_spend": round(self.total_spend, 2),
+            "finished": sorted(self.finished),
+        }
+
+    def check(self, games):
+        # Compara com um recálculo do zero; retorna as chaves que divergem (vazio = consistente)
+        fresh = LibraryStats()
+        fresh.rebuild(games)
+        mine, theirs = self.snapshot(), fresh.snapshot()
+        return [key for key in mine if mine[key] != theirs[key]]
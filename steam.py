@@ -0,0 +1,182 @@
+import os, sys, json
+
+from storage import write_atomic
+
+STEAM_SCAN_CACHE = os.path.join("cache", "steam_scan.json")
+STEAM_STORE_URL = "https://store.steampowered.com/app/{}"
+# Ferramentas que a Steam instala como "apps" e que não são jogos
+STEAM_TOOL_PREFIXES = ("Proton ", "Proton-", "Steam Linux Runtime", "Steamworks Common Redistributables",
+                       "SteamVR", "Steam Audio")
+
+
+def parse_vdf(text):
+    # KeyValues da Valve: "chave" "valor" ou "chave" { ... }
+    root, stack, key = {}, [], None
+    node = root
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == '"':
+            j, buf = i + 1, []
+            while j < n and text[j] != '"':
+                if text[j] == "\\" and j + 1 < n:
+                    j += 1
+                    buf.append({"n": "\n", "t": "\t"}.get(text[j], text[j]))
+                else:
+                    buf.append(text[j])
+                j += 1
+            token = "".join(buf)
+            i = j + 1
+            if key is None:
+                key = token
+            else:
+                node[key] = token
+                key = None
+        elif c == "{":
+            child = {}
+            node[key] = child
+            stack.append(node)
+            node, key = child, None
+            i += 1
+        elif c == "}":
+            node = stack.pop() if stack else root
+            key = None
+            i += 1
+        elif c == "/" and text.startswith("//", i):
+            i = text.find("\n", i)
+            i = n if i < 0 else i
+        else:
+            i += 1
+    return root
+
+
+def read_vdf(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return parse_vdf(f.read())
+
+
+def steam_roots():
+    # Pastas de instalação da Steam; GAMESLOG_STEAM_DIR tem prioridade (útil para testar com fixtures)
+    env = os.environ.get("GAMESLOG_STEAM_DIR")
+    if env:
+        return [env]
+    candidates = []
+    if sys.platform == "win32":
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam") as key:
+                candidates.append(winreg.QueryValueEx(key, "SteamPath")[0])
+        except OSError:
+            pass
+        candidates += [os.path.expandvars(r"%ProgramFiles(x86)%\Steam"), os.path.expandvars(r"%ProgramFiles%\Steam")]
+    elif sys.platform == "darwin":
+        candidates.append(os.path.expanduser("~/Library/Application Support/Steam"))
+    else:
+        candidates += [os.path.expanduser("~/.steam/steam"), os.path.expanduser("~/.local/share/Steam"),
+                       os.path.expanduser("~/.var/app/com.valvesoftware.Steam/.local/share/Steam")]
+    roots, seen = [], set()
+    for path in candidates:
+        real = os.path.realpath(path)
+        if os.path.isdir(os.path.join(real, "steamapps")) and real not in seen:
+            seen.add(real)
+            roots.append(real)
+    return roots
+
+
+def library_folders(root):
+    # steamapps de cada biblioteca listada em libraryfolders.vdf (formato novo e antigo), incluindo a raiz
+    folders = [os.path.join(root, "steamapps")]
+    for vdf in (os.path.join(root, "steamapps", "libraryfolders.vdf"), os.path.join(root, "config", "libraryfolders.vdf")):
+        if not os.path.exists(vdf):
+            continue
+        data = read_vdf(vdf)
+        entries = data.get("libraryfolders") or data.get("LibraryFolders") or {}
+        for key, value in entries.items():
+            if not key.isdigit():
+                continue
+            path = value.get("path") if isinstance(value, dict) else value
+            if path:
+                folders.append(os.path.join(root, path, "steamapps"))
+        break
+    unique, seen = [], set()
+    for folder in folders:
+        real = os.path.realpath(folder)
+        if real not in seen and os.path.isdir(real):
+            seen.add(real)
+            unique.append(real)
+    return unique
+
+
+def is_tool(name):
+    return name.startswith(STEAM_TOOL_PREFIXES)
+
+
+class SteamScanner:
+    """Lê os appmanifest_*.acf de todas as bibliotecas da Steam, sem rede.
+
+    O cache guarda, por manifesto, (mtime_ns, tamanho, appid, nome); numa
+    nova varredura só os manifestos novos ou alterados são lidos de novo.
+    """
+
+    def __init__(self, roots=None, cache_path=STEAM_SCAN_CACHE):
+        self.roots = steam_roots() if roots is None else list(roots)
+        self.cache_path = cache_path
+        self.cache = self._load_cache()
+        self.parsed = 0     # manifestos lidos na última varredura (os demais vieram do cache)
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        write_atomic(self.cache_path, self.cache)
+
+    def scan(self):
+        # Retorna [(appid, nome)] dos jogos instalados, sem repetir appid entre bibliotecas
+        cache, self.parsed = {}, 0
+        apps = {}
+        for root in self.roots:
+            for folder in library_folders(root):
+                try:
+                    entries = list(os.scandir(folder))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if not (entry.name.startswith("appmanifest_") and entry.name.endswith(".acf")):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    hit = self.cache.get(entry.path)
+                    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                        record = hit
+                    else:
+                        state = read_vdf(entry.path).get("AppState", {})
+                        self.parsed += 1
+                        record = [st.st_mtime_ns, st.st_size, state.get("appid", ""), state.get("name", "")]
+                    cache[entry.path] = record
+                    appid, name = record[2], record[3]
+                    if appid and name and not is_tool(name):
+                        apps.setdefault(appid, name)
+        self.cache = cache
+        self._save_cache()
+        return sorted(apps.items(), key=lambda a: a[1].casefold())
+
+
+def steam_games(apps):
+    # Valores no formato de make_game para cada (appid, nome)
+    return [{"Nome": name, "Plataforma/Loja": "Steam", "Status": "Não jogado", "Link": STEAM_STORE_URL.format(appid)}
+            for appid, name in apps]
+
+
+if __name__ == '__main__':
+    # python steam.py [pasta_da_steam ...] — lista os jogos encontrados (ex.: python steam.py fixtures/steam)
+    scanner = SteamScanner(sys.argv[1:] or None, cache_path=os.path.join("cache", "steam_scan_cli.json"))
+    for appid, name in scanner.scan():
+        print(f"{appid}\t{name}")
+    print(f"{scanner.parsed} manifestos lidos, o resto veio do cache", file=sys.stderr)
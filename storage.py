@@ -0,0 +1,290 @@
+import os, json, sqlite3, threading, uuid
+
+from tracing import span, traced
+
+STORAGE_BACKENDS = ("json", "sqlite")
+
+
+def new_game_id():
+    return uuid.uuid4().hex
+
+
+# Campos de um jogo, na ordem em que aparecem no JSON
+GAME_FIELDS = {
+    "Nome": "",
+    "Plataforma/Loja": "",
+    "Data de compra": "",
+    "Preço pago": "",
+    "Nº comprovante": "",
+    "Nota pessoal": "",
+    "Status": "",
+    "Imagem": None,
+    "Imagem_manual": False,
+    "Gênero": "",
+    "Descrição": "",
+    "Data lançamento": "",
+    "Desenvolvedor": "",
+    "Link": "",
+    "Favorito": False,
+    "Anotações": "",
+}
+
+
+def make_game(values):
+    # Jogo novo com id e todos os campos (os ausentes ficam com o valor padrão)
+    game = {"id": new_game_id()}
+    for field, default in GAME_FIELDS.items():
+        game[field] = values.get(field, default)
+    return game
+
+
+def ensure_ids(games):
+    # Bibliotecas antigas não têm "id"; atribui um para cada jogo e retorna quantos foram criados
+    created = 0
+    for game in games:
+        if not game.get("id"):
+            game["id"] = new_game_id()
+            created += 1
+    return created
+
+
+JOURNAL_COMPACT_RECORDS = 500   # compacta o journal depois de tantas mutações
+
+
+@traced("json.dump")
+def write_atomic(path, games):
+    # Grava em arquivo temporário e troca com rename: um crash nunca deixa o arquivo truncado
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(games, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def write_bytes_atomic(path, data, fsync=False):
+    # O mesmo para bytes prontos (blobs, backups, caches de imagem, trace); fsync só onde perder o arquivo perde dado
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def replay_journal(games, path):
+    # Reaplica as mutações do journal sobre o snapshot; put/del por id são idempotentes
+    if not os.path.exists(path):
+        return games
+    index = {g.get("id"): i for i, g in enumerate(games)}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue    # linha incompleta (crash no meio da escrita)
+            if rec.get("op") == "put":
+                game = rec["game"]
+                i = index.get(game["id"])
+                if i is None:
+                    index[game["id"]] = len(games)
+                    games.append(game)
+                else:
+                    games[i] = game
+            elif rec.get("op") == "del":
+                i = index.pop(rec["id"], None)
+                if i is not None:
+                    games[i] = None
+    return [g for g in games if g is not None]
+
+
+class JsonStorage:
+    """biblioteca.json como snapshot + journal append-only de mutações.
+
+    Cada lote de edições acrescenta registros pequenos (com fsync) em
+    biblioteca.json.journal; depois de JOURNAL_COMPACT_RECORDS registros o
+    journal é dobrado num snapshot novo, gravado de forma atômica.
+    Só a thread de persistência (PersistWorker) escreve aqui.
+    """
+    kind = "json"
+
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.journal = None
+        self.records = 0
+
+    def load(self):
+        games = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                games = json.load(f)
+        games = replay_journal(games, self.journal_path)
+        # Sobrou journal da sessão anterior: a primeira gravação já compacta
+        self.records = JOURNAL_COMPACT_RECORDS if self._journal_size() else 0
+        return games
+
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+
+    def _ends_with_newline(self):
+        with open(self.journal_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _append(self, records):
+        if self.journal is None:
+            torn = self._journal_size() and not self._ends_with_newline()
+            self.journal = open(self.journal_path, "a", encoding="utf-8")
+            if torn:
+                self.journal.write("\n")
+        with span("json.journal", records=len(records)):
+            for rec in records:
+                self.journal.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+        self.records += len(records)
+
+    def save_games(self, games):
+        self._append([{"op": "put", "game": g} for g in games])
+
+    def delete_games(self, ids):
+        self._append([{"op": "del", "id": i} for i in ids])
+
+    def save_all(self, games):
+        # Snapshot atômico; se cair antes de apagar o journal, o replay é idempotente
+        write_atomic(self.path, games)
+        self._close_journal()
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def wants_compaction(self):
+        return self.records >= JOURNAL_COMPACT_RECORDS
+
+    def compact(self, snapshot):
+        self.save_all(snapshot)
+
+    def _close_journal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        self.records = 0
+
+    def close(self):
+        self._close_journal()
+
+    # Consultas no JSON são filtros na lista em memória
+    def track(self, game):
+        pass
+
+    def untrack(self, game_id):
+        pass
+
+    def track_all(self, games):
+        pass
+
+
+class SqliteStorage:
+    """Biblioteca em SQLite (WAL): uma linha por jogo, com índices nas colunas filtradas.
+
+    O jogo completo fica em JSON na coluna data; Nome, Plataforma/Loja,
+    Status e Favorito são copiados para colunas indexadas.
+    """
+    kind = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id TEXT PRIMARY KEY,
+            pos INTEGER NOT NULL,
+            nome TEXT NOT NULL DEFAULT '',
+            plataforma TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL DEFAULT '',
+            favorito INTEGER NOT NULL DEFAULT 0,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_games_pos ON games(pos);
+        CREATE INDEX IF NOT EXISTS idx_games_nome ON games(nome COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_games_plataforma ON games(plataforma);
+        CREATE INDEX IF NOT EXISTS idx_games_status ON games(status);
+        CREATE INDEX IF NOT EXISTS idx_games_favorito ON games(favorito);
+    """
+
+    def __init__(self, path, import_json=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.SCHEMA)
+        self.objs = {}      # id -> dict do jogo carregado (para devolver os mesmos objetos nas consultas)
+        self.import_json = import_json
+
+    def _row(self, game, pos):
+        return (game["id"], pos, game.get("Nome", ""), game.get("Plataforma/Loja", ""),
+                game.get("Status", ""), int(bool(game.get("Favorito"))),
+                json.dumps(game, ensure_ascii=False))
+
+    def load(self):
+        with self.lock:
+            empty = self.db.execute("SELECT 1 FROM games LIMIT 1").fetchone() is None
+        if empty and self.import_json and os.path.exists(self.import_json):
+            # Primeira execução com SQLite: importa a biblioteca.json existente
+            games = JsonStorage(self.import_json).load()
+            ensure_ids(games)
+            self.save_all(games)
+        with self.lock:
+            rows = self.db.execute("SELECT data FROM games ORDER BY pos").fetchall()
+        games = [json.loads(data) for (data,) in rows]
+        self.objs = {g["id"]: g for g in games}
+        return games
+
+    def save_all(self, games):
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM games")
+            self.db.executemany("INSERT INTO games VALUES (?,?,?,?,?,?,?)",
+                                (self._row(g, i) for i, g in enumerate(games)))
+
+    def save_games(self, games):
+        # Um lote inteiro numa transação; cada jogo toca só a sua linha
+        with self.lock, self.db:
+            for game in games:
+                cur = self.db.execute(
+                    "UPDATE games SET nome=?, plataforma=?, status=?, favorito=?, data=? WHERE id=?",
+                    self._row(game, 0)[2:] + (game["id"],))
+                if cur.rowcount == 0:
+                    pos = self.db.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM games").fetchone()[0]
+                    self.db.execute("INSERT INTO games VALUES (?,?,?,?,?,?,?)", self._row(game, pos))
+
+    def delete_games(self, ids):
+        with self.lock, self.db:
+            self.db.executemany("DELETE FROM games WHERE id=?", ((i,) for i in ids))
+
+    def wants_compaction(self):
+        return False
+
+    def compact(self, snapshot):
+        pass
+
+    # objs aponta para os dicts vivos da GUI; é mantido pela thread da GUI
+    def track(self, game):
+        self.objs[game["id"]] = game
+
+    def untrack(self, game_id):
+        self.objs.pop(game_id, None)
+
+    def track_all(self, games):
+        self.objs = {g["id"]: g for g in games}
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def open_storage(kind, json_path, db_path):
+    if kind == "sqlite":
+        return SqliteStorage(db_path, import_json=json_path)
+    return JsonStorage(json_path)
@@ -0,0 +1,50 @@
+import io, sys, json
+
+import pytest
+
+from importer import JsonStream, iter_json
+
+GAMES = [{"Nome": "Hades", "Nota pessoal": 9.5}, {"Nome": "Celeste", "Preço pago": 1234567890}, "lixo"]
+
+
+@pytest.fixture(params=["stdlib", "ijson"])
+def reader(request, monkeypatch):
+    # Os dois caminhos do iter_json precisam aceitar os mesmos formatos
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setitem(sys.modules, "ijson", None)
+    return iter_json
+
+
+def write(tmp_path, data, bom=False):
+    path = tmp_path / "jogos.json"
+    path.write_text(("\ufeff" if bom else "") + json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return str(path)
+
+
+def test_top_level_array(reader, tmp_path):
+    assert list(reader(write(tmp_path, GAMES))) == GAMES[:2]
+
+
+def test_games_key(reader, tmp_path):
+    data = {"versao": 2, "meta": {"games": "não é aqui"}, "games": GAMES, "depois": [1, 2]}
+    assert list(reader(write(tmp_path, data, bom=True))) == GAMES[:2]
+
+
+def test_other_shapes_yield_nothing(reader, tmp_path):
+    assert list(reader(write(tmp_path, {"jogos": GAMES}))) == []
+    assert list(reader(write(tmp_path, []))) == []
+
+
+def test_stream_splits_values_across_chunks():
+    # Pedaços de 3 caracteres: números e strings cortados no meio do buffer
+    text = json.dumps([{"n": 12345, "s": "x" * 50}, 67890, [1, [2, 3]], "fim"])
+    stream = JsonStream(io.StringIO(text), chunk=3)
+    assert list(stream.items()) == json.loads(text)
+
+
+def test_stream_rejects_truncated_file():
+    stream = JsonStream(io.StringIO('[{"Nome": "Hades"}, {"Nome": '), chunk=4)
+    with pytest.raises(ValueError):
+        list(stream.items())
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from rawg import RawgClient, ResponseCache, TokenBucket
+from rawg_stub import RawgStub
+
+
+@pytest.fixture
+def stub():
+    with RawgStub() as server:
+        yield server
+
+
+@pytest.fixture
+def client(stub, tmp_path):
+    # Balde grande: os testes de cache não devem esperar pelo limite de taxa
+    return RawgClient("stub", stub.base_url, cache=ResponseCache(str(tmp_path / "rawg.db")), bucket=TokenBucket(1000, 1000))
+
+
+def test_game_data_parsed(client):
+    dados = client.game_data("Hades")
+    assert dados["nome"] == "Hades"
+    assert dados["genero"] == "Action, RPG, Indie"
+    assert dados["data_lancamento"] == "2020-09-17"
+    assert dados["dev"] == "Supergiant Games"
+    assert dados["link"] == "https://rawg.io/games/hades-2"
+    assert dados["imagem"].startswith("https://media.rawg.io/")
+    assert dados["descricao"].startswith("Hades is a god-like rogue-like")
+
+
+def test_repeat_lookup_served_from_cache(client, stub):
+    first = client.game_data("Hades")
+    seen = len(stub.requests_seen)
+    assert seen == 2    # busca + detalhes
+    assert client.game_data("  hades ") == first
+    assert len(stub.requests_seen) == seen
+
+
+def test_cache_survives_new_client(client, stub, tmp_path):
+    client.game_data("Celeste")
+    seen = len(stub.requests_seen)
+    other = RawgClient("stub", stub.base_url, cache=ResponseCache(str(tmp_path / "rawg.db")))
+    assert other.game_data("Celeste")["nome"] == client.game_data("Celeste")["nome"]
+    assert len(stub.requests_seen) == seen
+
+
+def test_empty_search_cached(client, stub):
+    assert client.game_data("Jogo Que Não Existe") == {}
+    seen = len(stub.requests_seen)
+    assert client.game_data("Jogo Que Não Existe") == {}
+    assert len(stub.requests_seen) == seen
+
+
+def test_404_cached_as_miss(client, stub):
+    assert client.details(999999) is None
+    assert client.cache.get("/999999?") == {"data": None}
+    seen = len(stub.requests_seen)
+    assert client.details(999999) is None
+    assert len(stub.requests_seen) == seen
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+    t0 = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # 2 na hora (capacidade) + 4 a 20/s = pelo menos 0,2 s
+    assert time.monotonic() - t0 >= 0.19
+
+
+def test_token_bucket_burst_is_immediate():
+    bucket = TokenBucket(rate=1, capacity=5)
+    t0 = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - t0 < 0.5
@@ -0,0 +1,53 @@
+import os, shutil
+
+import pytest
+
+from steam import SteamScanner, library_folders
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "steam")
+
+
+@pytest.fixture
+def root(tmp_path):
+    # Cópia da fixture: os testes de cache mexem no mtime dos manifestos
+    path = tmp_path / "steam"
+    shutil.copytree(FIXTURE, path)
+    return str(path)
+
+
+@pytest.fixture
+def scanner(root, tmp_path):
+    return SteamScanner([root], str(tmp_path / "cache" / "steam_scan.json"))
+
+
+def test_library_folders_resolves_relative_path(root):
+    folders = library_folders(root)
+    assert os.path.realpath(os.path.join(root, "steamapps")) in folders
+    assert os.path.realpath(os.path.join(root, "library2", "steamapps")) in folders
+    assert len(folders) == 2
+
+
+def test_scan_skips_tools(scanner):
+    assert "228980" not in dict(scanner.scan())
+
+
+def test_scan_dedupes_appid_across_libraries(scanner):
+    apps = scanner.scan()
+    assert apps == [("504230", "Celeste"), ("1145360", "Hades")]
+
+
+def test_rescan_uses_cache(root, scanner):
+    scanner.scan()
+    assert scanner.parsed == 4
+    again = SteamScanner([root], scanner.cache_path)
+    again.scan()
+    assert again.parsed == 0
+
+
+def test_touched_manifest_is_parsed_again(root, scanner):
+    scanner.scan()
+    manifest = os.path.join(root, "library2", "steamapps", "appmanifest_504230.acf")
+    st = os.stat(manifest)
+    os.utime(manifest, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    scanner.scan()
+    assert scanner.parsed == 1
@@ -0,0 +1,125 @@
+import os, json, time, functools, threading
+from collections import deque
+
+# Rastreamento opcional dos caminhos quentes: GAMESLOG_TRACE=1 ou o botão em Configurações.
+# Desligado, span() devolve um contexto vazio compartilhado e traced() só testa uma flag.
+TRACE_ON_START = os.environ.get("GAMESLOG_TRACE") == "1"
+TRACE_MAX_EVENTS = 200000   # eventos guardados para o trace; os mais antigos saem (o resumo conta todos)
+TRACE_PATH = os.path.join("cache", "trace.json")
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._record(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+class Tracer:
+    """Spans cronometrados (nome, início, duração, thread) e totais por nome.
+
+    export() grava no formato trace-event do Chrome (abre em chrome://tracing
+    e no ui.perfetto.dev); summary() lista os spans que mais custaram.
+    """
+
+    def __init__(self, enabled=False, max_events=TRACE_MAX_EVENTS):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.events = deque(maxlen=max_events)
+        self.stats = {}         # nome -> [contagem, total_ns, max_ns]
+        self.threads = {}       # ident -> nome da thread
+        self.pid = os.getpid()
+
+    def set_enabled(self, on):
+        self.enabled = bool(on)
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, args or None)
+
+    def traced(self, name):
+        def deco(fn):
+            @functools.wraps(fn)
+            def wrapper(*a, **kw):
+                if not self.enabled:
+                    return fn(*a, **kw)
+                with _Span(self, name, None):
+                    return fn(*a, **kw)
+            return wrapper
+        return deco
+
+    def _record(self, name, start, end, args):
+        dur = end - start
+        tid = threading.get_ident()
+        with self.lock:
+            if tid not in self.threads:
+                self.threads[tid] = threading.current_thread().name
+            self.events.append((name, start, dur, tid, args))
+            st = self.stats.get(name)
+            if st is None:
+                self.stats[name] = [1, dur, dur]
+            else:
+                st[0] += 1
+                st[1] += dur
+                if dur > st[2]:
+                    st[2] = dur
+
+    def clear(self):
+        with self.lock:
+            self.events.clear()
+            self.stats.clear()
+
+    def summary(self, limit=10):
+        # [(nome, contagem, total_ms, média_ms, máx_ms)], do maior tempo total para o menor
+        with self.lock:
+            rows = [(name, n, total / 1e6, total / n / 1e6, peak / 1e6) for name, (n, total, peak) in self.stats.items()]
+        rows.sort(key=lambda r: r[2], reverse=True)
+        return rows[:limit]
+
+    def export(self, path=TRACE_PATH):
+        with self.lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+        trace = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in threads.items()]
+        for name, start, dur, tid, args in events:
+            event = {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": self.pid, "tid": tid,
+                     "ts": start / 1000, "dur": dur / 1000}
+            if args:
+                event["args"] = {k: str(v) for k, v in args.items()}
+            trace.append(event)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Import tardio: storage importa tracing na carga do módulo
+        from storage import write_bytes_atomic
+        write_bytes_atomic(path, json.dumps({"traceEvents": trace, "displayTimeUnit": "ms"}).encode("utf-8"))
+        return len(events)
+
+
+TRACER = Tracer(TRACE_ON_START)
+span = TRACER.span
+traced = TRACER.traced